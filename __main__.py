@@ -1,61 +1,125 @@
 import time
+_started = time.perf_counter()
+
+import argparse
 import pygame
-import shutil
 from time import sleep
 from source.utils import *
 from source import Game, InteractionObject
 from source.const import GameState, ContainerState, TOTAL_PLAYER_ANIMATION_VALUE, Color
+from source.utils.timing import startup
+from source.utils.replay import InputRecorder, InputReplay
 
-DATA_FILES = [
-    'test_map.xml',
-    'test_map2.xml',
-    'test_map2b.xml',
-    'cave_entrance.xml',
-    'player_data.xml'
-]
+startup.record('imports', time.perf_counter() - _started)
 
 
-def main():
+def main(timings: bool = False, profile: int = 0, record: str | None = None):
     """The main looping function."""
     game = Game()
-    game.main_menu.open()
+    game.profiler.start(profile)
+    if record is not None:
+        game.recorder = InputRecorder(record)
+    with startup.time('main menu'):
+        game.main_menu.open()
+    
+    if timings:
+        print(startup.report())
     
     while game.state != GameState.ENDED:
         
-        game.screen.fill(Color.RGB.BLACK)
-        game.clock.tick(game.graphics['FPS']/game.graphics['SCALE']*4)
-        game.update()
+        game.settings.poll()
+        elapsed = game.clock.tick(game.settings.performance.target_fps) / 1000
+        game.profiler.run(game.update, elapsed)
         
         if game.state == GameState.RUNNING:
             #pygame.display.set_caption(f"{game.clock.get_fps()} FPS")
             pygame.display.set_caption(f"{game.player.position[0] // 4}, {game.player.position[1] // 4}")
             
-            if game.held_keys['w']:
-                game.player.face(Directions.NORTH)
-                game.player.move(north(game.player.position))
-                
-            elif game.held_keys['a']:
-                game.player.face(Directions.WEST)
-                game.player.move(west(game.player.position))
-                
-            elif game.held_keys['s']:
-                game.player.face(Directions.SOUTH)
-                game.player.move(south(game.player.position))
-                
-            elif game.held_keys['d']:
-                game.player.face(Directions.EAST)
-                game.player.move(east(game.player.position))
-            
-        pygame.display.flip()
+        game.renderer.present()
+    
+    game.profiler.stop()
+    if game.recorder is not None:
+        print(f"Recorded {len(game.recorder.frames)} frames --> {record} ({game.recorder.close()} bytes)")
+    pygame.quit()
+
+
+def headless(steps: int, rendering: bool = False, profile: int = 0) -> Game:
+    """
+    Runs the simulation without a display or audio, stepping as fast as possible.
+    
+    Args:
+        steps (int): The number of fixed simulation steps to run.
+        rendering (bool): Whether to draw each frame to an off-screen surface -- **default is** ``False``.
+        profile (int): The number of steps to profile -- **default is** ``0``.
+    """
+    game = Game(headless=True, rendering=rendering)
+    game.set_state(1)
+    game.profiler.start(profile)
     
-    # Reset the data files to their default values.
-    for filename in DATA_FILES:
-        shutil.copy(
-            f'resources/maps/data/defaults/{filename}',
-            f'resources/maps/data/{filename}')
+    started = time.perf_counter()
+    for _ in range(steps):
+        game.profiler.run(game.update, game.timestep)
+        game.renderer.present()
+    elapsed = time.perf_counter() - started
     
+    game.profiler.stop()
+    print(f"{steps} steps in {elapsed:.3f}s ({steps / max(elapsed, 1e-9):.0f} steps/s)")
     pygame.quit()
+    return game
+
+
+def replay(path: str, headless: bool = False, rendering: bool = False, realtime: bool = True, profile: int = 0) -> Game:
+    """
+    Replays recorded input from the main menu of a fresh game, frame by frame.
+    
+    Note:
+        - Each frame simulates its recorded elapsed time, so the same steps are run whatever the pace.
+    
+    Args:
+        path (str): The path of the input recording.
+        headless (bool): Whether to run without a display or audio -- **default is** ``False``.
+        rendering (bool): Whether to draw each frame when headless -- **default is** ``False``.
+        realtime (bool): Whether to pace the frames as they were recorded,
+            instead of as fast as possible -- **default is** ``True``.
+        profile (int): The number of frames to profile -- **default is** ``0``.
+    """
+    game = Game(headless=headless, rendering=rendering or not headless)
+    game.main_menu.open()
+    game.replay = InputReplay(path)
+    game.profiler.start(profile)
+    
+    started = deadline = time.perf_counter()
+    while not game.replay.finished and game.state != GameState.ENDED:
+        if realtime:
+            deadline += game.replay.peek().elapsed
+            sleep(max(deadline - time.perf_counter(), 0))
+        game.profiler.run(game.update, 0.0)
+        game.renderer.present()
+    elapsed = time.perf_counter() - started
+    
+    game.profiler.stop()
+    frames = game.replay.index
+    print(f"Replayed {frames} frames ({game.playtime:.1f}s played) in {elapsed:.3f}s "
+          f"({frames / max(elapsed, 1e-9):.0f} frames/s)")
+    pygame.quit()
+    return game
 
 
 if __name__ == '__main__':
-    main()
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--timings', action='store_true', help="print how long each startup phase took")
+    parser.add_argument('--headless', action='store_true', help="run the simulation with no display or audio")
+    parser.add_argument('--steps', type=int, default=1000, help="the number of steps to run when headless")
+    parser.add_argument('--render', action='store_true', help="draw frames off-screen when headless")
+    parser.add_argument('--profile', type=int, default=0, metavar='FRAMES', help="profile the first frames")
+    parser.add_argument('--record', metavar='PATH', help="record the input of every frame to a file")
+    parser.add_argument('--replay', metavar='PATH', help="replay recorded input (windowed unless --headless)")
+    parser.add_argument('--fast', action='store_true', help="replay as fast as possible instead of in real time")
+    args = parser.parse_args()
+    
+    if args.replay:
+        replay(args.replay, args.headless, args.render, not args.fast, args.profile)
+    elif args.headless:
+        headless(args.steps, args.render, args.profile)
+    else:
+        main(args.timings, args.profile, args.record)
@@ -0,0 +1,202 @@
+"""
+Times the map loading and frame rendering hot paths under the SDL dummy video driver.
+
+Usage:
+    python -m benchmarks.frames [--repeat 50] [--sizes 64 128 256 512] [--output results.json]
+    python -m benchmarks.frames --compare baseline.json [--threshold 0.1]
+"""
+
+import os
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+from typing import Callable
+import argparse
+import json
+import math
+import random
+import statistics
+import sys
+import time
+
+from source import Game
+from source.const import GameState
+from source.map import Map
+from source.map_cache import CACHE_DIRECTORY
+
+
+"""The characters that synthetic maps are made from."""
+SYNTHETIC_TILES = '^^^^--p*#'
+
+
+def measure(function: Callable[[], object], repeat: int, setup: Callable[[], object] | None = None) -> list[float]:
+    """
+    Times a function.
+
+    Args:
+        function (Callable): The function to time.
+        repeat (int): How many times to call the function.
+        setup (Callable | None): Called (untimed) before each call of the function.
+
+    Returns:
+        list[float]: The time (in seconds) taken by each call.
+    """
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        function()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def summarise(samples: list[float]) -> dict[str, float]:
+    """Gets the median and 99th percentile (in ms) of the timed samples."""
+    ordered = sorted(samples)
+    return {
+        'median_ms': statistics.median(ordered) * 1000,
+        'p99_ms': ordered[max(math.ceil(len(ordered) * 0.99) - 1, 0)] * 1000,
+        'runs': len(ordered),
+    }
+
+
+def write_synthetic_map(filename: str, size: int, containers: int, seed: int = 0) -> None:
+    """
+    Writes the layout and data files of a square map with randomly placed tiles and containers.
+
+    Args:
+        filename (str): The name of the map.
+        size (int): The width and height of the map (in tiles).
+        containers (int): The number of containers to place.
+        seed (int): The seed of the random tiles and positions.
+    """
+    rng = random.Random(seed)
+    rows = [[rng.choice(SYNTHETIC_TILES) for _ in range(size)] for _ in range(size)]
+    positions = {(rng.randrange(size), rng.randrange(size)) for _ in range(containers)}
+    for x, y in positions:
+        rows[y][x] = '+'
+
+    with open(f'resources/maps/{filename}.txt', 'w', encoding='utf-8') as layout:
+        layout.write('\n'.join(''.join(row) for row in rows))
+    with open(f'resources/maps/data/{filename}.xml', 'w', encoding='utf-8') as data:
+        data.write('<world><objects><containers>')
+        for x, y in sorted(positions):
+            data.write(
+                f'<container x="{x}" y="{y}"><items>'
+                f'<object type="Item" name="apple" image="None"/></items></container>')
+        data.write('</containers></objects></world>')
+
+
+def remove_map_files(filename: str) -> None:
+    """Removes the layout, data and compiled files of a map."""
+    for path in (
+            f'resources/maps/{filename}.txt', f'resources/maps/data/{filename}.xml',
+            f'resources/maps/{filename}.chunks', f'{CACHE_DIRECTORY}/{filename}.map'):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def benchmark_loads(game: Game, filenames: list[str], repeat: int) -> dict[str, dict[str, float]]:
+    """Times loading each map, both from its compiled cache and from its source files."""
+    results = {}
+    for filename in filenames:
+        def load() -> None:
+            Map(game).load(filename)
+
+        def uncache() -> None:
+            for path in (f'{CACHE_DIRECTORY}/{filename}.map', f'resources/maps/{filename}.chunks'):
+                if os.path.exists(path):
+                    os.remove(path)
+
+        results[f'Map.load[{filename}, cold]'] = summarise(measure(load, max(repeat // 5, 1), uncache))
+        results[f'Map.load[{filename}]'] = summarise(measure(load, repeat))
+    return results
+
+
+def benchmark_frames(game: Game, repeat: int) -> dict[str, dict[str, float]]:
+    """Times each part of rendering a frame, and a full `Game.update` frame."""
+    game.renderer.mode = 'full'
+    game.set_state(1)
+    game.player.position = (game.map.width * 2, game.map.height * 2)
+    game.camera.update()
+
+    results = {
+        'Map.render': measure(game.map.render, repeat),
+        'Player.render': measure(game.player.render, repeat),
+        'Player.render_topbar': measure(game.player.render_topbar, repeat),
+        'Game.update': measure(lambda: (game.update(game.timestep), game.renderer.present()), repeat),
+    }
+
+    game.main_menu.open()
+    game.state = GameState.MAIN_MENU
+    results['Game.render_menu'] = measure(game.render_menu, repeat)
+    game.main_menu.close()
+    return {name: summarise(samples) for name, samples in results.items()}
+
+
+def compare(results: dict[str, dict[str, float]], baseline: dict[str, dict[str, float]], threshold: float) -> list[str]:
+    """
+    Compares the median times against a baseline.
+
+    Args:
+        results (dict): The current results.
+        baseline (dict): The stored baseline results.
+        threshold (float): How much slower (as a fraction) a median can be before it is a regression.
+
+    Returns:
+        list[str]: The names of the benchmarks that regressed.
+    """
+    regressions = []
+    print(f"{'benchmark':<40} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        before, after = baseline[name]['median_ms'], result['median_ms']
+        change = after / before - 1 if before else 0.0
+        flag = ''
+        if change > threshold:
+            regressions.append(name)
+            flag = '  REGRESSION'
+        print(f"{name:<40} {before:>10.3f} {after:>10.3f} {change:>+8.1%}{flag}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--sizes', type=int, nargs='*', default=[64, 128, 256, 512])
+    parser.add_argument('--output', help="the path to write the results (JSON) to")
+    parser.add_argument('--compare', help="the path of the baseline results (JSON) to compare against")
+    parser.add_argument('--threshold', type=float, default=0.1)
+    args = parser.parse_args()
+
+    game = Game(headless=True, rendering=True)
+    synthetic = [f'zz_bench_{size}' for size in args.sizes]
+    try:
+        for filename, size in zip(synthetic, args.sizes):
+            write_synthetic_map(filename, size, containers=size)
+        results = benchmark_loads(game, game.maps + synthetic, args.repeat)
+        results.update(benchmark_frames(game, args.repeat))
+    finally:
+        for filename in synthetic:
+            remove_map_files(filename)
+
+    print(f"{'benchmark':<40} {'median (ms)':>12} {'p99 (ms)':>10}")
+    for name, result in results.items():
+        print(f"{name:<40} {result['median_ms']:>12.3f} {result['p99_ms']:>10.3f}")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(results, file, indent=2)
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as file:
+            baseline = json.load(file)
+        print()
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
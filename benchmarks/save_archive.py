@@ -0,0 +1,84 @@
+"""
+Measures the save and load latency, and the archive size, of synthetic worlds.
+
+Usage:
+    python -m benchmarks.save_archive [--containers 1000 5000 20000] [--repeat 20]
+"""
+
+from statistics import median
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from source.utils.save_handling import read_archive, write_archive
+from source.world import WorldState
+
+
+def synthetic_save(containers: int, seed: int = 0) -> dict:
+    """
+    Creates the save data of a world where items were taken from every container.
+
+    Args:
+        containers (int): The number of changed containers.
+        seed (int): The seed of the random item names and positions.
+    """
+    rng = random.Random(seed)
+    world = WorldState()
+    for index in range(containers):
+        filename = f'map_{index % 64}'
+        position = rng.randrange(1024), rng.randrange(1024)
+        for _ in range(rng.randint(1, 4)):
+            world.remove_item(filename, position, rng.choice(('apple', 'sword', 'potion', f'key_{index}')))
+        if index % 8 == 0:
+            world.unlock_door(filename, (rng.randrange(1024), rng.randrange(1024)))
+    return {
+        'player': {
+            'equipped': 'sword', 'health': 80, 'max_health': 100, 'damage': 5,
+            'items': [{'type': 'Item', 'name': f'item_{i}', 'image': None} for i in range(64)],
+        },
+        'world': world.to_dict(),
+    }
+
+
+def run(containers: int, repeat: int) -> dict[str, float]:
+    """
+    Times saving and loading a synthetic world.
+
+    Args:
+        containers (int): The number of changed containers.
+        repeat (int): How many times to save and load the world.
+
+    Returns:
+        dict[str, float]: The median save and load times (in ms), and the archive size (in bytes).
+    """
+    data = synthetic_save(containers)
+    saves, loads = [], []
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'slot.sav')
+        for _ in range(repeat):
+            started = time.perf_counter()
+            size = write_archive(path, data)
+            saves.append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            WorldState.from_dict(read_archive(path)['world'])
+            loads.append(time.perf_counter() - started)
+    return {'save': median(saves) * 1000, 'load': median(loads) * 1000, 'size': size}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--containers', type=int, nargs='+', default=[100, 1000, 5000, 20000])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'containers':>10} {'save (ms)':>10} {'load (ms)':>10} {'size (KB)':>10}")
+    for containers in args.containers:
+        result = run(containers, args.repeat)
+        print(f"{containers:>10} {result['save']:>10.2f} {result['load']:>10.2f} {result['size'] / 1024:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,20 +1,21 @@
 import source.const
 import source.utils
+from .assets import AssetManager, assets
 from .container import Container
 from .items import Item, InteractionObject, KeyItem
 from .door import Door, DoorState
 from .entity import Entity
 from .game import GameState, Game
-from .map import Map, MapTiles
+from .map import Map, MapTiles, TileFlag
 from .player import Player, Inventory
 
 
 __all__ = [
-    'utils', 'const', 'Container',
+    'utils', 'const', 'AssetManager', 'assets', 'Container',
     'InteractionObject', 'Item', 'KeyItem',
     'DoorState', 'Door',
     'Entity',
     'GameState', 'Game',
-    'Map', 'MapTiles',
+    'Map', 'MapTiles', 'TileFlag',
     'Player', 'Inventory',
 ]
@@ -0,0 +1,115 @@
+"""Provides a shared, memory-budgeted cache for loading image assets."""
+
+from collections import OrderedDict
+import threading
+
+import pygame
+
+
+class AssetManager:
+    """Loads and caches the scaled, display-converted images used by the game.
+
+    Note:
+        - Images are keyed by their ``(path, size, mode)`` so each variant is only decoded once.
+        - When the total pixel memory exceeds the `budget`, the least recently used images are evicted.
+        - Loading is thread-safe, so maps can be prefetched on a worker thread (see `MapCache`).
+
+    Attributes:
+        budget (int): The maximum amount of pixel memory (in bytes) to keep cached.
+        size (int): The current amount of pixel memory (in bytes) being cached.
+        hits (int): The number of requests served from the cache.
+        misses (int): The number of requests that had to load the image from disk.
+        evictions (int): The number of images removed from the cache to stay within the budget.
+
+    Args:
+        budget (int): The maximum amount of pixel memory (in bytes) to keep cached.
+    """
+    MODES = (None, 'convert', 'alpha')
+
+    def __init__(self, budget: int = 128 * 1024 ** 2) -> None:
+        self.budget = budget
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._cache: OrderedDict[tuple, pygame.Surface] = OrderedDict()
+        self._lock = threading.RLock()
+
+    def load(
+            self, path: str, size: tuple[int, int] | None = None,
+            mode: str | None = 'alpha') -> pygame.Surface:
+        """
+        Gets an image from the cache, loading it from disk if it isn't cached.
+
+        Args:
+            path (str): The path of the image file.
+            size (tuple[int, int] | None): The size to scale the image to -- **default is** ``None``.
+            mode (str | None): How to convert the image for the display (``convert``, ``alpha`` or ``None``).
+
+        Raises:
+            ValueError: If the conversion mode isn't recognised.
+
+        Returns:
+            Surface: The loaded image.
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown conversion mode '{mode}', expected one of {self.MODES}.")
+        if pygame.display.get_surface() is None:
+            mode = None  # Images can only be converted once the display exists.
+        if size is not None:
+            size = int(size[0]), int(size[1])
+
+        key = (path, size, mode)
+        with self._lock:
+            if key in self._cache:
+                self.hits += 1
+                self._cache.move_to_end(key)
+                return self._cache[key]
+
+            self.misses += 1
+            image = pygame.image.load(path)
+            if size is not None:
+                image = pygame.transform.scale(image, size)
+            if mode == 'convert':
+                image = image.convert()
+            elif mode == 'alpha':
+                image = image.convert_alpha()
+
+            self._cache[key] = image
+            self.size += self.memory(image)
+            self._evict()
+            return image
+
+    @staticmethod
+    def memory(image: pygame.Surface) -> int:
+        """Gets the amount of pixel memory (in bytes) used by an image."""
+        return image.get_width() * image.get_height() * image.get_bytesize()
+
+    def _evict(self) -> None:
+        """Removes the least recently used images until the cache is within the budget."""
+        with self._lock:
+            while self.size > self.budget and len(self._cache) > 1:
+                _, image = self._cache.popitem(last=False)
+                self.size -= self.memory(image)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Removes every image from the cache."""
+        with self._lock:
+            self._cache.clear()
+            self.size = 0
+
+    def stats(self) -> dict[str, int]:
+        """Gets the current cache statistics."""
+        return {
+            'entries': len(self._cache),
+            'size': self.size,
+            'budget': self.budget,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+
+"""The shared asset manager used throughout the game."""
+assets = AssetManager()
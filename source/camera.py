@@ -0,0 +1,70 @@
+"""Provides the camera that scrolls the game world around the player."""
+
+from pygame import Rect
+
+from source.const import SCALE
+
+
+class Camera:
+    """
+    Follows the player, translating world positions (in pixels) into screen positions.
+
+    Note:
+        - The world is drawn below the top-bar, within the `viewport`.
+        - The camera is clamped to the edges of the map, so maps smaller than the viewport don't scroll.
+
+    Attributes:
+        offset (tuple[int, int]): The world position (in pixels) shown at the top-left of the viewport.
+
+    Args:
+        game (Game): The main game object.
+        top (int): The height of the screen reserved above the world -- **default is** ``100``.
+    """
+    def __init__(self, game, top: int = 100) -> None:
+        self.game = game
+        self.top = top
+        self.offset = (0, 0)
+
+    @property
+    def viewport(self) -> Rect:
+        """The area of the screen that the world is drawn within."""
+        width, height = self.game.screen.get_size()
+        return Rect(0, self.top, width, max(height - self.top, 0))
+
+    def update(self) -> None:
+        """Centres the camera on the player, redrawing the whole screen when it has moved."""
+        viewport = self.viewport
+        scale = self.game.graphics['SCALE']
+        x, y = self.game.player.render_position
+        centre = x * scale - (scale * 2) + 20, y * scale - (scale * 3) + 20
+
+        # The interpolated position is fractional, the offset is kept in whole pixels.
+        offset = tuple(
+            0 if size <= view else min(max(round(point - view // 2), 0), size - view)
+            for point, view, size in zip(
+                centre, viewport.size, (self.game.map.width * SCALE, self.game.map.height * SCALE)))
+        if offset != self.offset:
+            self.offset = offset
+            self.game.renderer.invalidate()
+
+    def apply(self, x: float, y: float) -> tuple[int, int]:
+        """
+        Translates a world position (in pixels) into a screen position.
+
+        Args:
+            x (float): The horizontal world position.
+            y (float): The vertical world position.
+        """
+        return int(x - self.offset[0]), int(y - self.offset[1] + self.top)
+
+    def visible_tiles(self) -> tuple[range, range]:
+        """Gets the range of tile columns and rows that are within the viewport."""
+        viewport = self.viewport
+        x, y = self.offset
+        return (
+            range(max(x // SCALE, 0), min(-(-(x + viewport.width) // SCALE), self.game.map.width)),
+            range(max(y // SCALE, 0), min(-(-(y + viewport.height) // SCALE), self.game.map.height)))
+
+    def is_visible(self, rect: Rect) -> bool:
+        """Whether an area of the screen overlaps the viewport."""
+        return self.viewport.colliderect(rect)
@@ -0,0 +1,172 @@
+"""Provides a chunked, memory-mapped map format for streaming very large maps."""
+
+from collections import OrderedDict
+from typing import Callable
+import struct
+import os
+
+import numpy as np
+import pygame
+
+
+"""The width and height (in tiles) of each chunk."""
+CHUNK_SIZE = 16
+
+"""The header of a chunk file --> {```(magic, version, width, height, chunk_size)```}."""
+HEADER = struct.Struct('<4sHIIH')
+MAGIC = b'TDMC'
+VERSION = 1
+
+
+def compile_chunks(source: str, path: str, chunk_size: int = CHUNK_SIZE) -> None:
+    """
+    Converts a ``.txt`` map layout into a chunk file.
+
+    Note:
+        - The layout is streamed one band of chunks at a time, so the whole map is never held in memory.
+
+    Args:
+        source (str): The path of the map layout.
+        path (str): The path to write the chunk file to.
+        chunk_size (int): The width and height (in tiles) of each chunk.
+    """
+    width = height = 0
+    with open(source, 'r', encoding='utf-8') as layout:
+        for line in layout:
+            width = max(width, len(line.strip()))
+            height += 1
+    columns = -(-width // chunk_size)
+    rows = -(-height // chunk_size)
+
+    with open(source, 'r', encoding='utf-8') as layout, open(f'{path}.tmp', 'wb') as file:
+        file.write(HEADER.pack(MAGIC, VERSION, width, height, chunk_size))
+        for _ in range(rows):
+            band = np.zeros((chunk_size, columns * chunk_size), dtype=np.uint8)
+            for y in range(chunk_size):
+                line = layout.readline()
+                if not line:
+                    break
+                data = line.strip().encode('ascii', 'replace')
+                band[y, :len(data)] = np.frombuffer(data, dtype=np.uint8)
+            file.write(band.reshape(chunk_size, columns, chunk_size).transpose(1, 0, 2).tobytes())
+    os.replace(f'{path}.tmp', path)
+
+
+class Chunk:
+    """
+    A decoded chunk of a streamed map.
+
+    Attributes:
+        position (tuple[int, int]): The chunk coordinates --> {```(column, row)```}.
+        tiles (ndarray): Object array of the decoded tiles.
+        collision (ndarray): Array of the `TileFlag` bit flags for each position.
+        layer (Surface | None): The baked textures of the chunk.
+    """
+    def __init__(self, position: tuple[int, int], tiles: np.ndarray, collision: np.ndarray) -> None:
+        self.position = position
+        self.tiles = tiles
+        self.collision = collision
+        self.layer: pygame.Surface | None = None
+
+
+class ChunkStore:
+    """
+    Streams the chunks of a memory-mapped chunk file, keeping only those near the player decoded.
+
+    Attributes:
+        width (int): The width of the map (in tiles).
+        height (int): The height of the map (in tiles).
+        chunk_size (int): The width and height (in tiles) of each chunk.
+        budget (int): The maximum number of decoded chunks to keep.
+
+    Args:
+        path (str): The path of the chunk file.
+        decode (Callable): Decodes the characters of a chunk --> {```decode(position, chars) -> Chunk```}.
+        budget (int): The maximum number of decoded chunks to keep.
+
+    Raises:
+        ValueError: If the file isn't a supported chunk file.
+    """
+    def __init__(
+            self, path: str, decode: Callable[[tuple[int, int], np.ndarray], Chunk], budget: int = 64) -> None:
+        with open(path, 'rb') as file:
+            magic, version, self.width, self.height, self.chunk_size = HEADER.unpack(file.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"'{path}' isn't a supported chunk file.")
+
+        self.columns = -(-self.width // self.chunk_size)
+        self.rows = -(-self.height // self.chunk_size)
+        self.budget = budget
+        self._decode = decode
+        self._chunks: OrderedDict[tuple[int, int], Chunk] = OrderedDict()
+        self._chars = np.memmap(
+            path, dtype=np.uint8, mode='r', offset=HEADER.size,
+            shape=(self.rows, self.columns, self.chunk_size, self.chunk_size))
+
+    @property
+    def chunks(self) -> list[Chunk]:
+        """The currently decoded chunks."""
+        return list(self._chunks.values())
+
+    def get(self, cx: int, cy: int) -> Chunk | None:
+        """
+        Gets a chunk, decoding it if it isn't loaded.
+
+        Args:
+            cx (int): The column of the chunk.
+            cy (int): The row of the chunk.
+
+        Returns:
+            Chunk | None: The chunk, or ``None`` if it is outside the map.
+        """
+        if not (0 <= cx < self.columns and 0 <= cy < self.rows):
+            return None
+        if (cx, cy) in self._chunks:
+            self._chunks.move_to_end((cx, cy))
+            return self._chunks[cx, cy]
+
+        chunk = self._decode((cx, cy), np.array(self._chars[cy, cx]))
+        self._chunks[cx, cy] = chunk
+        self._evict()
+        return chunk
+
+    def peek(self, cx: int, cy: int) -> Chunk | None:
+        """Gets a chunk only if it is already decoded."""
+        return self._chunks.get((cx, cy))
+
+    def stream(self, x: int, y: int, radius: int = 2) -> list[Chunk]:
+        """
+        Decodes the chunks around a tile position.
+
+        Args:
+            x (int): The column of the tile.
+            y (int): The row of the tile.
+            radius (int): How many chunks to load in each direction.
+
+        Returns:
+            list[Chunk]: The chunks that were newly decoded.
+        """
+        cx, cy = x // self.chunk_size, y // self.chunk_size
+        loaded = []
+        for row in range(cy - radius, cy + radius + 1):
+            for column in range(cx - radius, cx + radius + 1):
+                if (column, row) not in self._chunks:
+                    chunk = self.get(column, row)
+                    if chunk is not None:
+                        loaded.append(chunk)
+        # Refresh the nearest chunks last, so they are the last to be evicted.
+        for row in range(cy - 1, cy + 2):
+            for column in range(cx - 1, cx + 2):
+                if (column, row) in self._chunks:
+                    self._chunks.move_to_end((column, row))
+        return loaded
+
+    def _evict(self) -> None:
+        """Removes the least recently used chunks until the store is within the budget."""
+        while len(self._chunks) > max(self.budget, 1):
+            self._chunks.popitem(last=False)
+
+    def close(self) -> None:
+        """Forgets every decoded chunk and releases the memory-map."""
+        self._chunks.clear()
+        self._chars = None
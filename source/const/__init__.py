@@ -1,11 +1,13 @@
 from .geometry import SCALE
 from .states import GameState, ContainerState, EntityState, DoorState, MenuState
 from .icons import PLAYER_ICONS
-from .global_values import TOTAL_PLAYER_ANIMATION_VALUE
+from .global_values import (
+    TOTAL_PLAYER_ANIMATION_VALUE, TICK_RATE, MAX_FRAME_TIME, PLAYER_SPEED, PLAYER_ANIMATION_SPEED)
 from .color import Color
 
 __all__ = [
     'SCALE', 'PLAYER_ICONS', 'TOTAL_PLAYER_ANIMATION_VALUE',
+    'TICK_RATE', 'MAX_FRAME_TIME', 'PLAYER_SPEED', 'PLAYER_ANIMATION_SPEED',
     'GameState', 'ContainerState', 'EntityState', 'DoorState', 'MenuState',
     'Color'
 ]
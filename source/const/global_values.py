@@ -1 +1,13 @@
 TOTAL_PLAYER_ANIMATION_VALUE = 10
+
+"""The number of fixed simulation steps per second."""
+TICK_RATE = 30
+
+"""The longest frame (in seconds) that is simulated, so a stall doesn't cause a burst of catch-up steps."""
+MAX_FRAME_TIME = 0.25
+
+"""The walking speed of the player (in position units per second, there are 4 units per tile)."""
+PLAYER_SPEED = 30
+
+"""How quickly the walking animation of the player advances (in animation values per second)."""
+PLAYER_ANIMATION_SPEED = 30
@@ -1,5 +1,7 @@
 from source.utils import Directions
 from source.const import SCALE
+from source.assets import assets
+from collections.abc import Mapping
 import pygame
 
 """
@@ -31,67 +33,49 @@ TOPBAR_ICONS = {
 }
 
 """
-Dictionary containing loaded textures translated for map tiles.
+Dictionary containing the texture files translated for map tiles.
 """
-TILE_ICONS = {
-    'WALL': pygame.transform.scale(
-        pygame.image.load('resources/img/tiles/red_brick.png'),
-        (SCALE, SCALE)),
-    'ROCK_WALL': pygame.transform.scale(
-        pygame.image.load('resources/img/tiles/rockwall.png'),
-        (SCALE, SCALE)),
-    'CAVE_DOOR': pygame.transform.scale(
-        pygame.image.load('resources/img/tiles/cave_door.png'),
-        (SCALE, SCALE)),
-    'ROCK_CORNER': pygame.transform.scale(
-        pygame.image.load('resources/img/tiles/rock_corner.png'),
-        (SCALE, SCALE)),
-    'ROCK_EDGE': pygame.transform.scale(
-        pygame.image.load('resources/img/tiles/rock_edge.png'),
-        (SCALE, SCALE)),
-    'GRASS': pygame.transform.scale(
-        pygame.image.load('resources/img/tiles/grass1.png'),
-        (SCALE, SCALE)),
-    'TILES': pygame.transform.scale(
-        pygame.image.load('resources/img/tiles/tiles.png'),
-        (SCALE, SCALE)),
-    'BACK_WALL': pygame.transform.scale(
-        pygame.image.load('resources/img/tiles/back_wall.png'),
-        (SCALE, SCALE)),
-    'LEFT_WALL': pygame.transform.scale(
-        pygame.image.load('resources/img/tiles/left_wall.png'),
-        (SCALE, SCALE)),
-    'RIGHT_WALL': pygame.transform.scale(
-        pygame.image.load('resources/img/tiles/right_wall.png'),
-        (SCALE, SCALE)),
-    'FRONT_LEFT_WALL': pygame.transform.scale(
-        pygame.image.load('resources/img/tiles/front_left_wall.png'),
-        (SCALE, SCALE)),
-    'FRONT_RIGHT_WALL': pygame.transform.scale(
-        pygame.image.load('resources/img/tiles/front_right_wall.png'),
-        (SCALE, SCALE)),
-    'DOOR': pygame.transform.scale(
-        pygame.image.load('resources/img/tiles/tiles.png'),
-        (SCALE, SCALE)),
-    'LEFT_DOOR': pygame.transform.scale(
-        pygame.image.load('resources/img/tiles/left_door.png'),
-        (SCALE, SCALE)),
-    'RIGHT_DOOR': pygame.transform.scale(
-        pygame.image.load('resources/img/tiles/right_door.png'),
-        (SCALE, SCALE)),
-    'CRATE': pygame.transform.scale(
-        pygame.image.load('resources/img/tiles/crate.png'),
-        (SCALE, SCALE)),
-    'ROOFTOP': pygame.transform.scale(
-        pygame.image.load('resources/img/tiles/rooftop.png'),
-        (SCALE, SCALE)),
-    'BACK_ROOFTOP': pygame.transform.scale(
-        pygame.image.load('resources/img/tiles/back_rooftop.png'),
-        (SCALE, SCALE)),
-    'PATH_H': pygame.transform.scale(
-        pygame.image.load('resources/img/tiles/dirt_path.png'),
-        (SCALE, SCALE)),
-    'TREE': pygame.transform.scale(
-        pygame.image.load('resources/img/tiles/tree.png'),
-        (SCALE, SCALE)),
+TILE_PATHS = {
+    'WALL': 'resources/img/tiles/red_brick.png',
+    'ROCK_WALL': 'resources/img/tiles/rockwall.png',
+    'CAVE_DOOR': 'resources/img/tiles/cave_door.png',
+    'ROCK_CORNER': 'resources/img/tiles/rock_corner.png',
+    'ROCK_EDGE': 'resources/img/tiles/rock_edge.png',
+    'GRASS': 'resources/img/tiles/grass1.png',
+    'TILES': 'resources/img/tiles/tiles.png',
+    'BACK_WALL': 'resources/img/tiles/back_wall.png',
+    'LEFT_WALL': 'resources/img/tiles/left_wall.png',
+    'RIGHT_WALL': 'resources/img/tiles/right_wall.png',
+    'FRONT_LEFT_WALL': 'resources/img/tiles/front_left_wall.png',
+    'FRONT_RIGHT_WALL': 'resources/img/tiles/front_right_wall.png',
+    'DOOR': 'resources/img/tiles/tiles.png',
+    'LEFT_DOOR': 'resources/img/tiles/left_door.png',
+    'RIGHT_DOOR': 'resources/img/tiles/right_door.png',
+    'CRATE': 'resources/img/tiles/crate.png',
+    'ROOFTOP': 'resources/img/tiles/rooftop.png',
+    'BACK_ROOFTOP': 'resources/img/tiles/back_rooftop.png',
+    'PATH_H': 'resources/img/tiles/dirt_path.png',
+    'TREE': 'resources/img/tiles/tree.png',
 }
+
+
+class TileIcons(Mapping):
+    """
+    Read-only mapping of the map tile textures (Key: Tile name).
+    
+    Textures are only loaded (through the asset manager) the first time that a map references them.
+    """
+    def __getitem__(self, key: str) -> pygame.Surface:
+        return assets.load(TILE_PATHS[key], (SCALE, SCALE))
+    
+    def __iter__(self):
+        return iter(TILE_PATHS)
+    
+    def __len__(self) -> int:
+        return len(TILE_PATHS)
+
+
+"""
+Lazily loaded textures translated for map tiles.
+"""
+TILE_ICONS = TileIcons()
@@ -0,0 +1,118 @@
+"""Provides an in-memory store of the NPC dialog scripts."""
+
+from array import array
+import mmap
+import os
+
+
+class Script:
+    """
+    A single dialog script, indexed by the byte offset of each line.
+
+    Note:
+        - Scripts larger than the `DialogStore` mmap threshold are memory-mapped rather than read.
+
+    Attributes:
+        path (str): The path of the script file.
+        offsets (array): The byte offset of the start of each line, followed by the end of the file.
+    """
+    def __init__(self, path: str, mmap_threshold: int) -> None:
+        self.path = path
+        self._file = open(path, 'rb')
+        if os.fstat(self._file.fileno()).st_size > mmap_threshold:
+            self.data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self.data = self._file.read()
+            self._file.close()
+            self._file = None
+
+        self.offsets = array('Q', [0])
+        position = self.data.find(b'\n')
+        while position != -1:
+            self.offsets.append(position + 1)
+            position = self.data.find(b'\n', position + 1)
+        if self.offsets[-1] != len(self.data):
+            self.offsets.append(len(self.data))
+        self._lines: dict[int, str] = {}
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> str:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f"Line {index} is out of range for '{self.path}'.")
+        if index not in self._lines:
+            self._lines[index] = self.data[self.offsets[index]:self.offsets[index + 1]] \
+                .decode('utf-8').replace('\r\n', '\n')
+        return self._lines[index]
+
+    def close(self) -> None:
+        """Closes the memory-map (if any) backing the script."""
+        if self._file is not None:
+            self.data.close()
+            self._file.close()
+            self._file = None
+
+
+class DialogStore:
+    """
+    Loads the dialog scripts from ``resources/npc/dialogs`` once, so NPCs can fetch lines without file access.
+
+    Attributes:
+        directory (str): The directory containing the dialog scripts.
+        mmap_threshold (int): Scripts larger than this (in bytes) are memory-mapped.
+
+    Args:
+        directory (str): The directory containing the dialog scripts.
+        mmap_threshold (int): Scripts larger than this (in bytes) are memory-mapped -- **default is** 1MB.
+    """
+    def __init__(self, directory: str = 'resources/npc/dialogs', mmap_threshold: int = 1024 ** 2) -> None:
+        self.directory = directory
+        self.mmap_threshold = mmap_threshold
+        self._scripts: dict[str, Script] = {}
+
+    def get(self, script: str) -> Script:
+        """
+        Gets a script, loading and indexing it on first use.
+
+        Args:
+            script (str): The name of the script (without the ``.txt`` extension).
+
+        Raises:
+            FileNotFoundError: If the script doesn't exist.
+        """
+        if script not in self._scripts:
+            self._scripts[script] = Script(
+                os.path.join(self.directory, f'{script}.txt'), self.mmap_threshold)
+        return self._scripts[script]
+
+    def line(self, script: str, index: int) -> str:
+        """
+        Gets a single line of a script.
+
+        Args:
+            script (str): The name of the script.
+            index (int): The index of the line.
+
+        Raises:
+            IndexError: If the script doesn't have the line.
+        """
+        return self.get(script)[index]
+
+    def length(self, script: str) -> int:
+        """Gets the number of lines in a script."""
+        return len(self.get(script))
+
+    def preload(self) -> None:
+        """Loads every script in the `directory`."""
+        for filename in os.listdir(self.directory):
+            if filename.endswith('.txt'):
+                self.get(filename[:-len('.txt')])
+
+    def close(self) -> None:
+        """Closes and forgets every loaded script."""
+        for script in self._scripts.values():
+            script.close()
+        self._scripts.clear()
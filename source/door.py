@@ -52,10 +52,10 @@ class Door(InteractionObject):
                     if item.name != self.key:
                         continue
                     self.state = DoorState.UNLOCKED
+                    self.game.world.unlock_door(self.location, self.position)
                     return self.interact()
                 continue
             return msg.showinfo("Knock Knock...", "The door appears to be locked!")
         
-        self.game.map.tiles = []
-        self.game.map.load(self.destination)  # Travel to next room.
+        self.game.travel(self.destination)  # Travel to next room.
         self.game.player.position = self.spawn
@@ -1,17 +1,28 @@
 """Main Game Module."""
 
 from typing import Any
+from source.assets import assets
+from source.camera import Camera
+from source.dialog import DialogStore
 from source.map import Map
+from source.npc import NPCStore
+from source.map_cache import MapCache
+from source.world import WorldState
 from source.player import Player
-from source.main_menu import MainMenu
+from source.main_menu import MainMenu, NEW_SLOT
+from source.renderer import Renderer
 from source.utils import *
-from source.const import GameState, ContainerState, MenuState, Color
+from source.const import GameState, ContainerState, MenuState, Color, TICK_RATE, MAX_FRAME_TIME
 from source.container import Container
 from source.utils.save_handling import load_game, save_game
+from source.utils.save_index import SaveIndex
+from source.utils.timing import FrameTimer, startup
+from source.utils.profiling import FrameProfiler
+from source.utils.replay import InputRecorder, InputReplay
 import pygame
+import os
 import multiprocessing
 from pygame import Surface
-import tomli
 
 
 class Game:
@@ -19,18 +30,37 @@ class Game:
     
     Attributes:
         maps (list[str | bytes]):           Contains all the map files for loading into areas.
+        saves (SaveIndex):                  The save slots and their metadata, kept in memory.
+        playtime (float):                   The time spent playing (in seconds).
+        headless (bool):                    Whether the game is running without a display or audio.
+        rendering (bool):                   Whether frames are drawn, off-screen when `headless`.
+        timestep (float):                   The length of each fixed simulation step (in seconds).
+        alpha (float):                      How far the current frame is between the last two simulation steps.
         state (Enum):                       Defines the current game state (*i.e.* ``RUNNING``... *etc.*)
-        settings (dict):                    All parsed settings values int topics --> {```dict[topic][_Kw]```}.
+        settings (Settings):                The parsed settings, reloaded when ``settings.toml`` changes.
         graphics (dict):                    Specifically the graphical settings --> {```dict[_Kw]```}.
         geometry (tuple[int, int]):         The set screen size from the graphical setting --> {```(Width, Height)```}.
-        screen (Surface):                   The main screen display.
+        display (Surface):                  The main window display.
+        screen (Surface):                   The surface that the game is rendered to (scaled onto the `display`).
         clock (Clock):                      The internal clock, for handling frame refresh rates.
+        renderer (Renderer):                Tracks the changed areas of the screen and presents the frame.
+        frame_timer (FrameTimer):           Times each phase of the recent frames (``F3`` overlay, ``F4`` CSV export).
+        profiler (FrameProfiler):           Profiles the next frames of `update` on demand (``F5``).
+        recorder (InputRecorder | None):    Records the input of every frame, when set.
+        replay (InputReplay | None):        Replaces the input of every frame with a recording, when set.
+        dialogs (DialogStore):              The in-memory store of NPC dialog scripts.
         player (Player):                    The main player object.
         map (Map):                          Contains methods for loading map files and rending the environment.
+        loaded_maps (MapCache):             The recently visited maps, kept loaded with their runtime state.
+        world (WorldState):                 The changes made to the map data, only written when the game is saved.
+        camera (Camera):                    Follows the player, translating world positions into screen positions.
     """
     savefile = 'default'
     save_slot = None
-    slots = []
+    playtime = 0.0
+    timestep = 1 / TICK_RATE
+    alpha = 0.0
+    _accumulator = 0.0
     
     user_text = ''
     
@@ -43,44 +73,101 @@ class Game:
     map_containers = []
     map_doors = []
     map_keys = []
-    npc = []
+    npc = NPCStore()
     state = GameState.NONE
     
-    def __init__(self) -> None:
-        """Initializes the `Game` class."""
+    def __init__(self, headless: bool = False, rendering: bool | None = None) -> None:
+        """Initializes the `Game` class.
+        
+        Args:
+            headless (bool): Whether to run on the SDL dummy drivers, with no display or audio
+                -- **default is** ``False``.
+            rendering (bool | None): Whether frames are drawn (off-screen when headless),
+                defaults to ``False`` when headless.
+        """
+        self.headless = headless
+        self.rendering = not headless if rendering is None else rendering
+        
         # set the save / load slots
-        with open('resources/maps/data/saves/index.toml', 'rb') as indexes:
-            slots = tomli.load(indexes)['slots']
-            self.slots = [slots[str(i)] for i in range(1, 5)]
+        self.saves = SaveIndex()
         
         # initialize pygame
-        pygame.init()
+        if headless:
+            os.environ['SDL_VIDEODRIVER'] = 'dummy'
+            os.environ['SDL_AUDIODRIVER'] = 'dummy'
+        with startup.time('pygame.init'):
+            pygame.init()
         
         # create fonts
-        self.fonts = {
-            'MENU': pygame.font.Font(None, 24),
-            'MAIN_MENU': pygame.font.Font(None, 50),
-            'MAIN': pygame.font.SysFont('Jetbrains Mono', 50, True),
-            'HEALTH': pygame.font.Font(None, 30),
-            'DIALOG': pygame.font.Font(None, 20),
-        }
+        with startup.time('fonts'):
+            self.fonts = {
+                'MENU': pygame.font.Font(None, 24),
+                'MAIN_MENU': pygame.font.Font(None, 50),
+                'MAIN': pygame.font.SysFont('Jetbrains Mono', 50, True),
+                'HEALTH': pygame.font.Font(None, 30),
+                'DIALOG': pygame.font.Font(None, 20),
+            }
         
-        self.settings = Settings(self)
-        self.graphics = self.settings.get_graphics()
+        with startup.time('settings'):
+            self.settings = Settings(self)
+            self.graphics = self.settings.get_graphics()
         self.geometry: tuple[int, int] = (
             int(self.graphics['Width']),
             int(self.graphics['Height'])
         )
-        self.screen = pygame.display.set_mode(pygame.display.get_desktop_sizes()[0])
+        with startup.time('display'):
+            if headless:
+                self.display = pygame.display.set_mode(self.geometry)
+            else:
+                self.display = pygame.display.set_mode(pygame.display.get_desktop_sizes()[0])
         self.clock = pygame.time.Clock()
+        self.frame_timer = FrameTimer()
+        self.profiler = FrameProfiler()
+        self.recorder: InputRecorder | None = None
+        self.replay: InputReplay | None = None
+        self.renderer = Renderer(self, self.settings.performance.render_mode)
+        self.apply_settings(self.settings)
+        self.settings.subscribe(self.apply_settings)
         
+        self.dialogs = DialogStore()
+        self.world = WorldState()
         self.player = Player(self)
         self.map = Map(self)
+        self.loaded_maps = MapCache(
+            self.load_map, self.settings.performance.map_cache, lambda loaded: self.world.capture(loaded))
+        self.camera = Camera(self)
         self.main_menu = MainMenu(self)
         
         #self.state = GameState.MAIN_MENU
         
-        self.set_area(0)
+        with startup.time('first map load'):
+            self.set_area(0)
+    
+    def apply_settings(self, settings: Settings) -> None:
+        """
+        Applies the (re)loaded settings to the clock, renderer and caches.
+        
+        Args:
+            settings (Settings): The parsed settings.
+        """
+        performance = settings.performance
+        self.graphics = settings.get_graphics()
+        self.renderer.mode = performance.render_mode
+        assets.budget = performance.texture_budget * 1024 ** 2
+        if getattr(self, 'loaded_maps', None) is not None:
+            self.loaded_maps.capacity = performance.map_cache
+            for loaded in self.loaded_maps:
+                if loaded.chunks is not None:
+                    loaded.chunks.budget = performance.chunk_budget
+        
+        # Render to an internal surface when it isn't the same size as the window.
+        width, height = self.display.get_size()
+        size = int(width * performance.render_scale), int(height * performance.render_scale)
+        if size == (width, height):
+            self.screen = self.display
+        elif getattr(self, 'screen', None) is None or self.screen.get_size() != size:
+            self.screen = pygame.Surface(size).convert()
+        self.renderer.invalidate()
     
     def set_state(self, state: int) -> None:
         """Sets the game state from a numerical value."""
@@ -109,42 +196,146 @@ class Game:
     def set_area(self, index: int) -> None:
         """Sets the current map file (***** check usage...)"""
         try:
-            if self.map.current_file == self.maps[index]:
-                return
-            self.map.load(self.maps[index])
+            self.travel(self.maps[index])
         except IndexError as exc:
             raise IndexError(exc) from exc
     
+    def load_map(self, filename: str) -> Map:
+        """Creates and loads a new map."""
+        loaded = Map(self)
+        loaded.load(filename)
+        return loaded
+    
+    def travel(self, filename: str) -> None:
+        """
+        Switches the active map, reusing it from `loaded_maps` if it was visited recently.
+        
+        Args:
+            filename (str): The name of the map to travel to.
+        """
+        self.map = self.loaded_maps.get(filename)
+        self.npc = self.map.npc
+        self.renderer.invalidate()
+    
+    def prefetch(self) -> None:
+        """Starts loading the destinations of the doors near the player in the background."""
+        radius = self.settings.performance.prefetch_radius
+        destinations = set()
+        if radius:
+            x, y = self.player.position[0] // 4, self.player.position[1] // 4
+            destinations = self.map.door_destinations(x, y, radius)
+        
+        # Maps prefetched for doors that are now out of range are dropped, keeping memory bounded.
+        self.loaded_maps.retain(destinations)
+        for destination in destinations:
+            self.loaded_maps.prefetch(destination)
+    
     def render(self) -> None:
         """Groups together rendering methods to be called from the main event loop."""
-        self.map.render()
-        self.player.render()
-        for npc_type in self.npc:
-            for npc in npc_type:
+        self.camera.update()
+        with self.frame_timer.phase('world'):
+            self.map.render()
+        with self.frame_timer.phase('entities'):
+            self.player.render()
+            for npc in self.npc.visible(self.camera):
                 npc.render()
         
         if self.state == GameState.OPEN_MENU or self.state == GameState.MAIN_MENU:
-            self.render_menu()
+            with self.frame_timer.phase('menus'):
+                self.render_menu()
+        
+        if self.frame_timer.visible:
+            with self.frame_timer.phase('hud'):
+                self.render_timings()
     
-    def update(self) -> None:
-        """Updates the current events and visual properties."""
-        self.screen.fill(Color.RGB.BLACK)
+    def render_timings(self) -> None:
+        """Renders the rolling average and worst time of each phase of the recent frames."""
+        font = self.fonts['DIALOG']
+        summary = self.frame_timer.summary()
+        overlay = pygame.Surface((220, 20 + 16 * len(summary)))
+        overlay.fill(Color.RGB.CHARCOAL)
+        overlay.blit(font.render(f"{'phase':<10} avg / worst (ms)", True, Color.RGB.YELLOW), (5, 5))
+        for i, (name, (average, worst)) in enumerate(summary.items()):
+            overlay.blit(font.render(
+                f"{name:<10} {average:6.2f} / {worst:6.2f}", True, Color.RGB.WHITE), (5, 21 + 16 * i))
+        
+        position = (self.screen.get_width() - overlay.get_width() - 5, self.camera.top + 5)
+        self.screen.blit(overlay, position)
+        self.renderer.mark(overlay.get_rect(topleft=position))
+    
+    def update(self, elapsed: float = 0.0) -> None:
+        """
+        Updates the current events and visual properties.
+        
+        Args:
+            elapsed (float): The time since the last frame (in seconds), to simulate -- **default is** ``0``.
+        """
+        self.renderer.begin()
         if self.state == GameState.RUNNING:
             self.main_menu.options[0] = "Continue"
             self.main_menu.options[1] = "Save Game"
-        elif self.state == GameState.MAIN_MENU:
-            if self.main_menu.state == MenuState.LOAD or \
-                    self.main_menu.state == MenuState.SAVE:
-                self.main_menu.options = []
-                for savefile in self.slots:
-                    if savefile == 'default':
-                        self.main_menu.options.append("Empty")
-                        continue
-                    self.main_menu.options.append(savefile)
-        self.handle_events()
-        self.render()
+            self.prefetch()
+        with self.frame_timer.phase('events'):
+            elapsed, events = self.poll_input(elapsed)
+            self.handle_events(events)
+        with self.frame_timer.phase('simulation'):
+            self.advance(elapsed)
+        if self.rendering:
+            self.render()
+    
+    def advance(self, elapsed: float) -> int:
+        """
+        Runs the fixed simulation steps that fit into the elapsed time, carrying the remainder over.
+        
+        Args:
+            elapsed (float): The time since the last frame (in seconds).
+        
+        Returns:
+            int: The number of simulation steps that were run.
+        """
+        self._accumulator += min(elapsed, MAX_FRAME_TIME)
+        steps = 0
+        while self._accumulator >= self.timestep:
+            self.step(self.timestep)
+            self._accumulator -= self.timestep
+            steps += 1
+        self.alpha = self._accumulator / self.timestep
+        return steps
     
-    def handle_events(self) -> Any:
+    def step(self, dt: float) -> None:
+        """
+        Advances the game simulation by a fixed timestep.
+        
+        Args:
+            dt (float): The length of the timestep (in seconds).
+        """
+        if self.state != GameState.RUNNING:
+            # Hold the player still, so the interpolated position doesn't drift while paused.
+            self.player.previous_position = self.player.position
+            return
+        self.player.step(dt)
+        self.playtime += dt
+    
+    def poll_input(self, elapsed: float) -> tuple[float, list[pygame.event.Event]]:
+        """
+        Gets the input of this frame, replaying it (keeping only real quit events) and recording it if needed.
+        
+        Args:
+            elapsed (float): The time since the last frame (in seconds).
+        
+        Returns:
+            tuple[float, list[Event]]: The time to simulate and the events to handle.
+        """
+        events = pygame.event.get()
+        if self.replay is not None:
+            frame = self.replay.next()
+            elapsed = frame.elapsed
+            events = frame.to_events() + [event for event in events if event.type == pygame.QUIT]
+        if self.recorder is not None:
+            self.recorder.record(elapsed, events)
+        return elapsed, events
+    
+    def handle_events(self, events: list[pygame.event.Event] | None = None) -> Any:
         """
         Handles game events such player input.
         
@@ -152,11 +343,23 @@ class Game:
             IMPORTANT!!! 
             
             ~ provides event handler for closing the window **don't** remove! ~
+        
+        Args:
+            events (list[Event] | None): The events to handle -- **default is** the pending pygame events.
         """
         
-        for event in pygame.event.get():
+        for event in pygame.event.get() if events is None else events:
             if event.type == pygame.QUIT:
                 self.state = GameState.ENDED
+            
+            # Frame timing overlay and export, and profiler capture.
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                self.frame_timer.visible = not self.frame_timer.visible
+                self.renderer.invalidate()
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F4:
+                self.frame_timer.export_csv('frame_timings.csv')
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F5:
+                self.profiler.start()
                 
             if self.state == GameState.RUNNING:
                 if event.type == pygame.KEYUP:
@@ -268,7 +471,7 @@ class Game:
                             else:
                                 load_game(self, self.selected_index+1)
                             
-                            if self.main_menu.options[self.selected_index] != 'Empty':
+                            if self.main_menu.options[self.selected_index] not in ('Empty', NEW_SLOT):
                                 self.main_menu.close()
                         
                         if event.key == pygame.K_ESCAPE:
@@ -301,29 +504,36 @@ class Game:
                 text = self.fonts['MENU'].render(item.name, True, color)
                 menu.blit(text, (0, i * 25))
             header.blit(menu, (5, 20))
+            x, y = self.camera.offset
             if self.player.position[0] <= 152:
-                self.screen.blit(header, ((self.player.position[0] + 2) * scale, self.player.position[1] * scale))
-                return
-            self.screen.blit(header, ((self.player.position[0] - 20) * scale, self.player.position[1] * scale))
+                position = ((self.player.position[0] + 2) * scale - x, self.player.position[1] * scale - y)
+            else:
+                position = ((self.player.position[0] - 20) * scale - x, self.player.position[1] * scale - y)
+            self.screen.blit(header, position)
+            self.renderer.mark(header.get_rect(topleft=position))
         
         # Main Menu rendering
         elif self.state == GameState.MAIN_MENU:
             # Render MainMenu
-            _rect = pygame.Rect(0, 0, self.geometry[0]*4, self.geometry[1]*4)
-            img = pygame.transform.scale(
-                pygame.image.load('resources/img/stoneface.png'),
-                (self.geometry[0]*2, self.geometry[1]*1.5))
-            self.screen.blit(img, _rect)
-            #self.screen.fill(rgb.CRIMSON)
-            screen_width, screen_height = pygame.display.get_window_size()
+            screen_width, screen_height = self.screen.get_size()
             
-            if self.main_menu.state == MenuState.LOAD or self.main_menu.state == MenuState.SAVE or \
-                    self.main_menu.state == MenuState.CREATE_SAVE:
-                self.screen.blit(self.main_menu.widgets['title'], ((screen_width/9) - 5, 45))
+            # The background and title only change along with the menu state.
+            if self.renderer.redraw or not self.renderer.is_dirty:
+                _rect = pygame.Rect(0, 0, self.geometry[0]*4, self.geometry[1]*4)
+                img = assets.load(
+                    'resources/img/stoneface.png',
+                    (self.geometry[0]*2, self.geometry[1]*1.5))
+                self.screen.blit(img, _rect)
+                #self.screen.fill(rgb.CRIMSON)
+                
+                if self.main_menu.state == MenuState.LOAD or self.main_menu.state == MenuState.SAVE or \
+                        self.main_menu.state == MenuState.CREATE_SAVE:
+                    self.screen.blit(self.main_menu.widgets['title'], ((screen_width/9) - 5, 45))
             
             _ = self.main_menu.widgets['border']
             _.fill(Color.RGB.TAUPE)
             self.screen.blit(_, ((screen_width/3) - 5, 95))
+            self.renderer.mark(_.get_rect(topleft=((screen_width/3) - 5, 95)))
             
             _ = self.main_menu.widgets['panel']
             _.fill(Color.RGB.BLACK)
@@ -339,18 +549,19 @@ class Game:
                     ((screen_width/3) + 10, 120)
                 )
             else:
-                for i, item in enumerate(self.main_menu.options):
+                # Only the 4 slots around the selected one fit in the panel.
+                first = max(0, min(self.selected_index - 3, len(self.main_menu.options) - 4))
+                for i, item in enumerate(self.main_menu.options[first:first + 4], first):
+                    row = i - first
                     color = Color.RGB.MAUVE if self.selected_index == i else Color.RGB.CHARCOAL
                     
                     _ = self.main_menu.widgets['label']
                     _.fill(color)
-                    self.screen.blit(_, ((screen_width/3) + 10, 110 + ((175/3) * i)))
+                    self.screen.blit(_, ((screen_width/3) + 10, 110 + ((175/3) * row)))
                     
                     color = Color.RGB.BLACK if self.selected_index == i else Color.RGB.GRAY
                     self.screen.blit(self.fonts['MAIN_MENU'].render(item, 0, color), (
-                        (screen_width/3) + 10, 110 + ((170/3) * i + ((170/3)/3))))
-            
-        pygame.display.flip()
+                        (screen_width/3) + 10, 110 + ((170/3) * row + ((170/3)/3))))
     
     def open_container(self, container):
         """
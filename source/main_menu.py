@@ -3,6 +3,10 @@ import pygame
 from source.const import MenuState, GameState, Color
 
 
+"""The save menu option that saves into a slot after the existing ones."""
+NEW_SLOT = 'New Slot'
+
+
 class MainMenu:
     """
     The main menu for the game.
@@ -60,6 +64,7 @@ class MainMenu:
                 }
             case 2:
                 self.state = MenuState.LOAD
+                self.options = list(self.game.saves.options)
                 self.widgets = {
                     'border': pygame.Surface(((self.width / 3) + 10, 270)),
                     'panel' : pygame.Surface((self.width / 3, 260)),
@@ -70,6 +75,8 @@ class MainMenu:
                 self.game.update()
             case 3:
                 self.state = MenuState.SAVE
+                # The trailing option is the slot after the last one (``len(saves) + 1``), growing the index.
+                self.options = [*self.game.saves.options, NEW_SLOT]
                 self.widgets = {
                     'border': pygame.Surface(((self.width / 3) + 10, 270)),
                     'panel' : pygame.Surface((self.width / 3, 260)),
@@ -1,14 +1,18 @@
 import xml.etree.ElementTree as element
-from xml.etree.ElementTree import Element
 
-from source.const import SCALE
+from source.assets import assets
+from source.chunks import Chunk, ChunkStore, compile_chunks
+from source.const import SCALE, Color, DoorState, EntityState
 from source.const.icons import TILE_ICONS
 from source.container import Container, InteractionObject, Item
 from source.door import Door, KeyItem
-from source.npc import StoryNPC, EnemyNPC
+from source.map_cache import CompiledMap, read_compiled, write_compiled
+from source.npc import NPCStore, StoryNPC, EnemyNPC
 
-from enum import Enum
+from enum import Enum, IntFlag
 from typing import TextIO
+import numpy as np
+import os
 import pygame
 
 
@@ -18,7 +22,7 @@ class Tile:
     Holds property data relating to an area on the map.
     
     Attributes:
-        texture: The texture to be rendered.
+        image: The texture, or the `TILE_ICONS` name of the texture to be rendered.
         is_passable (bool): Whether the player can pass through the area.
         can_interact (bool): Whether the player can interact with the area.
     """
@@ -28,15 +32,51 @@ class Tile:
         """Initializes the `Tile`.
         
         Args:
-            image: The image to display when rendered.
+            image: The image (or `TILE_ICONS` name of the image) to display when rendered.
             passable (bool): Whether the player can pass through the area.
             can_interact (bool): Whether the player can interact with the area.
             _object (object): Linked item to the tile.
         """
-        self.texture = image
+        self.image = image
         self.is_passable = passable
         self.can_interact = can_interact
         self.object = _object
+    
+    @property
+    def texture(self) -> pygame.Surface:
+        """The texture to be rendered, loaded on first use when given by name."""
+        if isinstance(self.image, str):
+            return TILE_ICONS[self.image]
+        return self.image
+
+
+class TileFlag(IntFlag):
+    """
+    Bit flags stored for each position of the `Map` collision grid.
+    """
+    NONE = 0
+    PASSABLE = 1
+    INTERACTABLE = 2
+    OCCUPIED = 4
+
+
+def tile_flags(tile: Tile | tuple | None) -> TileFlag:
+    """Resolves the collision flags of a tile.
+    
+    Note:
+        - Layered tiles are only passable when every layer is passable,
+          and are interactable when any layer is interactable.
+    
+    Args:
+        tile (Tile | tuple | None): The tile (or layered tiles) to resolve.
+    """
+    layers = [layer for layer in (tile if isinstance(tile, tuple) else (tile,)) if isinstance(layer, Tile)]
+    flags = TileFlag.NONE
+    if layers and all(layer.is_passable for layer in layers):
+        flags |= TileFlag.PASSABLE
+    if any(layer.can_interact and layer.object is not None for layer in layers):
+        flags |= TileFlag.INTERACTABLE
+    return flags
 
 
 class MapTiles:
@@ -46,21 +86,80 @@ class MapTiles:
         WALL (Tile): Un-passable, un-interactive `Tile` containing the imaging for rendering walls.
         GRASS (TILE): Passable, un-interactive `Tile` containing the imaging for rendering floor.
     """
-    FRONT_RIGHT_WALL = Tile(TILE_ICONS['FRONT_RIGHT_WALL'], False, False, None)
-    FRONT_LEFT_WALL = Tile(TILE_ICONS['FRONT_LEFT_WALL'], False, False, None)
-    RIGHT_WALL = Tile(TILE_ICONS['RIGHT_WALL'], False, False, None)
-    ROCK_CORNER = Tile(TILE_ICONS['ROCK_CORNER'], False, False, None)
-    BACK_ROOFTOP = Tile(TILE_ICONS['BACK_ROOFTOP'], False, False, None)
-    ROCK_EDGE = Tile(TILE_ICONS['ROCK_EDGE'], False, False, None)
-    LEFT_WALL = Tile(TILE_ICONS['LEFT_WALL'], False, False, None)
-    BACK_WALL = Tile(TILE_ICONS['BACK_WALL'], False, False, None)
-    ROCK_WALL = Tile(TILE_ICONS['ROCK_WALL'], False, False, None)
-    ROOFTOP = Tile(TILE_ICONS['ROOFTOP'], False, False, None)
-    WALL = Tile(TILE_ICONS['WALL'], False, False, None)
-    GRASS = Tile(TILE_ICONS['GRASS'], True, False, None)
-    TILES = Tile(TILE_ICONS['TILES'], True, False, None)
-    PATH_H = Tile(TILE_ICONS['PATH_H'], True, False, None)
-    TREE = Tile(TILE_ICONS['TREE'], False, False, None)
+    FRONT_RIGHT_WALL = Tile('FRONT_RIGHT_WALL', False, False, None)
+    FRONT_LEFT_WALL = Tile('FRONT_LEFT_WALL', False, False, None)
+    RIGHT_WALL = Tile('RIGHT_WALL', False, False, None)
+    ROCK_CORNER = Tile('ROCK_CORNER', False, False, None)
+    BACK_ROOFTOP = Tile('BACK_ROOFTOP', False, False, None)
+    ROCK_EDGE = Tile('ROCK_EDGE', False, False, None)
+    LEFT_WALL = Tile('LEFT_WALL', False, False, None)
+    BACK_WALL = Tile('BACK_WALL', False, False, None)
+    ROCK_WALL = Tile('ROCK_WALL', False, False, None)
+    ROOFTOP = Tile('ROOFTOP', False, False, None)
+    WALL = Tile('WALL', False, False, None)
+    GRASS = Tile('GRASS', True, False, None)
+    TILES = Tile('TILES', True, False, None)
+    PATH_H = Tile('PATH_H', True, False, None)
+    TREE = Tile('TREE', False, False, None)
+
+
+"""
+Lookup table translating the characters of a map file into their `Tile` (or layered tiles).
+"""
+MAP_TILES: dict[str, Tile | tuple] = {
+    '#': MapTiles.BACK_WALL,
+    '[': MapTiles.LEFT_WALL,
+    ']': MapTiles.RIGHT_WALL,
+    '{': MapTiles.FRONT_LEFT_WALL,
+    '}': MapTiles.FRONT_RIGHT_WALL,
+    '-': MapTiles.TILES,
+    '%': (MapTiles.GRASS, MapTiles.RIGHT_WALL),
+    '&': (MapTiles.GRASS, MapTiles.LEFT_WALL),
+    '$': (MapTiles.BACK_WALL, MapTiles.LEFT_WALL),
+    ')': (MapTiles.GRASS, MapTiles.FRONT_RIGHT_WALL),
+    '(': (MapTiles.GRASS, MapTiles.FRONT_LEFT_WALL),
+    '^': MapTiles.GRASS,
+    'r': MapTiles.ROOFTOP,
+    'p': MapTiles.PATH_H,
+    '*': MapTiles.TREE,
+    'R': MapTiles.BACK_ROOFTOP,
+    '"': MapTiles.ROCK_WALL,
+    "'": (MapTiles.GRASS, MapTiles.ROCK_EDGE),
+    'c': MapTiles.ROCK_CORNER,
+}
+
+"""
+Characters of a map file for tiles that link to a container (``+``) or door (``P``, ``>``, ``/``, ``@``).
+"""
+OBJECT_CHARS = '+P>/@'
+
+# Tile ID 0 is an empty space, any other ID indexes into the palette of `MAP_TILES`.
+_TILE_PALETTE = np.empty(len(MAP_TILES) + 1, dtype=object)
+_TILE_LOOKUP = np.zeros(256, dtype=np.uint16)
+for _id, (_char, _tile) in enumerate(MAP_TILES.items(), start=1):
+    _TILE_PALETTE[_id] = _tile
+    _TILE_LOOKUP[ord(_char)] = _id
+"""Map layouts larger than this (in bytes) are streamed in chunks rather than decoded whole."""
+STREAM_THRESHOLD = 256 * 256
+
+_TILE_FLAGS = np.array([0, *(tile_flags(tile) for tile in MAP_TILES.values())], dtype=np.uint8)
+_OBJECT_CODES = np.frombuffer(OBJECT_CHARS.encode('ascii'), dtype=np.uint8)
+
+
+def layout_chars(text: str) -> tuple[np.ndarray, np.ndarray]:
+    """Reads the layout of a map file into an array of its characters.
+    
+    Args:
+        text (str): The contents of the map file.
+    
+    Returns:
+        tuple[ndarray, ndarray]: The characters (padded to the longest row) and the length of each row.
+    """
+    lines = [line.strip().encode('ascii', 'replace') for line in text.splitlines()]
+    width = max((len(line) for line in lines), default=0)
+    chars = np.frombuffer(
+        b''.join(line.ljust(width, b'\0') for line in lines), dtype=np.uint8).reshape(len(lines), width)
+    return chars, np.array([len(line) for line in lines], dtype=np.uint32)
 
 
 class Map:
@@ -70,9 +169,15 @@ class Map:
     FLOOR
     Attributes:
         tiles (list[list[Tile]]): Nested array of `Tiles` loaded from the map file.
+        tile_ids (ndarray): Array of the `MAP_TILES` IDs for each position (``0`` for empty or object tiles).
+        collision (ndarray): Array of the `TileFlag` bit flags for each position.
+        chunks (ChunkStore | None): Streams the chunks of large maps (`tiles`, `tile_ids` and `collision` are unused).
+        width (int): The width of the map (in tiles).
+        height (int): The height of the map (in tiles).
         current_map (TextIO): Open text stream of the map file containing the current map layout.
         current_file (str | bytes): The filename of the current map file.
         objects (list[object]): List containing objects to be rendered in.
+        npc (NPCStore): The friendly and enemy NPC's of the map.
         game (Game): The main game object.
     """
     filename: str
@@ -80,11 +185,17 @@ class Map:
     current_map: TextIO = None
     current_file: str | bytes = None
     objects: list[object]
+    npc: NPCStore
     doors: list[dict]
     containers: list[dict]
     friendly_npc: list[dict]
     enemy_npc: list[dict]
-    element_data: Element | None
+    tile_ids: np.ndarray | None = None
+    collision: np.ndarray | None = None
+    chunks: ChunkStore | None = None
+    width: int = 0
+    height: int = 0
+    layer: pygame.Surface | None = None
     
     def __init__(self, game) -> None:
         self.game = game
@@ -92,6 +203,10 @@ class Map:
     def load(self, filename: str) -> None:
         """Loads the `current_map` from a map file.
         
+        Note:
+            - The parsed layout and object data are compiled into a binary cache (see `source.map_cache`),
+              which is reused until either of the map files change.
+        
         Args:
             filename (str | bytes): The name of the files to read and load the map from.
         
@@ -99,19 +214,61 @@ class Map:
             FileNotFoundError: If the file cant be found.
         """
         self.filename = filename
-
-        self.containers = []
-        self.doors = []
-        self.friendly_npc = []
-        self.enemy_npc = []
-        self.game.npc = []
+        self.npc = NPCStore(level=self)
+        if getattr(self.game, 'map', None) is self:
+            self.game.npc = self.npc
+        if self.chunks is not None:
+            self.chunks.close()
+            self.chunks = None
         
-        tree = element.parse(f"resources/maps/data/{filename}.xml")
+        path = f"resources/maps/{filename}.txt"
+        try:
+            streamed = os.path.getsize(path) > STREAM_THRESHOLD
+            compiled = read_compiled(filename)
+            if compiled is None or (compiled.chars is None) != streamed:
+                compiled = self.compile(filename, streamed)
+            self.current_file = path
         
-        self.element_data = tree.getroot()
+        except FileNotFoundError as exc:
+            raise FileNotFoundError(exc) from exc
+        
+        self._build_objects(compiled.records)
+        
+        self._objects = {}
+        self._overrides = {}
+        self._occupied = set()
+        if streamed:
+            self._load_chunks(path)
+        else:
+            self.tiles = self._decode_layout(compiled.chars, compiled.lengths)
+        
+        for x, y in (self.npc.positions[self.npc.alive] // 4).tolist():
+            self.set_occupied(x, y)
+        self.bake()
+    
+    def compile(self, filename: str, streamed: bool = False) -> CompiledMap:
+        """Parses the layout and XML data files of a map, and writes them to the compiled map cache.
+        
+        Args:
+            filename (str): The name of the map.
+            streamed (bool): Whether the layout is streamed in chunks (and not compiled).
+        """
+        chars = lengths = None
+        if not streamed:
+            with open(f"resources/maps/{filename}.txt", 'r', encoding='utf-8') as map_file:
+                chars, lengths = layout_chars(map_file.read())
+        compiled = CompiledMap(self._parse_data(filename), chars, lengths)
+        write_compiled(filename, compiled)
+        return compiled
+    
+    @staticmethod
+    def _parse_data(filename: str) -> dict[str, list[dict]]:
+        """Parses the container, door and NPC records from the XML data file of a map."""
+        element_data = element.parse(f"resources/maps/data/{filename}.xml").getroot()
+        records = {'containers': [], 'doors': [], 'friendly': [], 'enemy': []}
         
         # Get all container data
-        for data in self.element_data.findall('.//container'):
+        for data in element_data.findall('.//container'):
             container = dict()
             container['x'] = int(data.attrib['x'])
             container['y'] = int(data.attrib['y'])
@@ -119,18 +276,16 @@ class Map:
             
             for item_data in data.findall('.//object'):
                 item = dict()
+                item['type'] = item_data.attrib['type']
                 item['name'] = item_data.attrib['name']
                 item['image'] = item_data.attrib['image'] if \
                     item_data.attrib['image'] != 'None' else None
-                if item_data.attrib['type'] == 'Item':
-                    container['items'].append(Item(item['name'], item['image']))
-                    continue
-                container['items'].append(KeyItem(item['name'], item['image'], None))
+                container['items'].append(item)
             
-            self.containers.append(container)
+            records['containers'].append(container)
         
         # Get all door data
-        for data in self.element_data.findall('.//door'):
+        for data in element_data.findall('.//door'):
             obj_attributes = ['x', 'y', 'state', 'key']  # Surface level attributes
             
             door = dict()
@@ -143,268 +298,438 @@ class Map:
             door['spawn']['x'] = int(data.find('.//spawn').attrib['x'])
             door['spawn']['y'] = int(data.find('.//spawn').attrib['y'])
             
-            self.doors.append(door)
+            records['doors'].append(door)
         
-        # Get all friendly NPC data
-        for data in self.element_data.findall('.//friendly'):
-            obj_attributes = [
-                'x', 'y', 'image', 'name', 'dialog',
-                'line', 'health', 'max_health', 'damage']
-            
-            friendly = dict()
-            for key in obj_attributes:
-                friendly[key] = int(data.attrib[key]) if data.attrib[key].isnumeric() \
-                    else data.attrib[key]
-            scripts = []
-            
-            for script in data.findall('.//script'):
-                scripts.append(script.attrib['file'])
-            friendly['scripts'] = scripts
-            
-            self.friendly_npc.append(friendly)
-
-        # Get all enemy NPC data.
-        for data in self.element_data.findall('.//enemy'):
-            obj_attributes = [
-                'x', 'y', 'image', 'name',
-                'health', 'max_health', 'damage']
-
-            enemy = dict()
-
-            for key in obj_attributes:
-                enemy[key] = int(data.attrib[key]) if data.attrib[key].isnumeric() \
-                    else data.attrib[key]
-            scripts = []
-
-            for script in data.findall('.//script'):
-                scripts.append(script.attrib['file'])
-            enemy['scripts'] = scripts
-
-            self.enemy_npc.append(enemy)
+        # Get all friendly and enemy NPC data
+        npc_attributes = {
+            'friendly': ['x', 'y', 'image', 'name', 'dialog', 'line', 'health', 'max_health', 'damage'],
+            'enemy': ['x', 'y', 'image', 'name', 'health', 'max_health', 'damage'],
+        }
+        for tag, obj_attributes in npc_attributes.items():
+            for data in element_data.findall(f'.//{tag}'):
+                npc = dict()
+                for key in obj_attributes:
+                    npc[key] = int(data.attrib[key]) if data.attrib[key].isnumeric() \
+                        else data.attrib[key]
+                npc['scripts'] = [script.attrib['file'] for script in data.findall('.//script')]
+                records[tag].append(npc)
         
-        # Generate NPC's
-        friendly_npcs = []
+        return records
+    
+    def _build_objects(self, records: dict[str, list[dict]]) -> None:
+        """Creates the containers, doors and NPC's of the map from their parsed records.
+        
+        Note:
+            - The changes made this session (see `WorldState`) are applied over the records.
+        """
+        self.containers = []
+        for data in records['containers']:
+            container = {**data, 'items': []}
+            removed = list(self.game.world.removed_items(self.filename, (data['x'], data['y'])))
+            for item in data['items']:
+                if item['name'] in removed:
+                    removed.remove(item['name'])
+                    continue
+                if item['type'] == 'Item':
+                    container['items'].append(Item(item['name'], item['image']))
+                    continue
+                container['items'].append(KeyItem(item['name'], item['image'], None))
+            self.containers.append(container)
+        
+        self.doors = records['doors']
+        self.friendly_npc = records['friendly']
+        self.enemy_npc = records['enemy']
+        
+        # Generate NPC's, their attributes are held together in the map's `NPCStore`.
+        # Changed NPC's are looked up by the position they spawn at (see `WorldState.capture`).
+        scale = self.game.graphics['SCALE']
         for npc_data in self.friendly_npc:
-            image = pygame.transform.scale(
-                pygame.image.load(
-                    f"resources/img/npc/{npc_data['image']}.png"),
-                (self.game.graphics['SCALE']**4, self.game.graphics['SCALE']**4))
+            image = assets.load(f"resources/img/npc/{npc_data['image']}.png", (scale * 4, scale * 4))
             name = npc_data['name']
             scripts = npc_data['scripts']
-            position = npc_data['x'], npc_data['y']
+            npc_data = {**npc_data, **self.game.world.npc_state(self.filename, (npc_data['x'], npc_data['y']))}
             
-            friendly_npcs.append(StoryNPC(
+            npc = StoryNPC(
                 self.game, friendly=True, name=name, image=image,
-                scripts=scripts, position=position, dialog=npc_data['dialog'], line=npc_data['line'],
-                health=npc_data['health'], max_health=npc_data['max_health'], damage=npc_data['damage']
-            ))
+                scripts=scripts, position=(npc_data['x'], npc_data['y']), dialog=npc_data['dialog'],
+                line=npc_data['line'], health=npc_data['health'], max_health=npc_data['max_health'],
+                damage=npc_data['damage'], store=self.npc
+            )
+            npc.state = EntityState(npc_data.get('state', EntityState.ALIVE.value))
 
-        enemy_npcs = []
         for npc_data in self.enemy_npc:
-            image = pygame.transform.scale(
-                pygame.image.load(
-                    f"resources/img/npc/{npc_data['image']}.png"),
-                (self.game.graphics['SCALE'] ** 4, self.game.graphics['SCALE'] ** 4))
+            image = assets.load(f"resources/img/npc/{npc_data['image']}.png", (scale * 4, scale * 4))
             name = npc_data['name']
-            position = npc_data['x'], npc_data['y']
+            npc_data = {**npc_data, **self.game.world.npc_state(self.filename, (npc_data['x'], npc_data['y']))}
 
-            friendly_npcs.append(EnemyNPC(
-                self.game, name=name, image=image, position=position,
-                health=npc_data['health'], max_health=npc_data['max_health'], damage=npc_data['damage']
-            ))
+            npc = EnemyNPC(
+                self.game, name=name, image=image, position=(npc_data['x'], npc_data['y']),
+                health=npc_data['health'], max_health=npc_data['max_health'], damage=npc_data['damage'],
+                store=self.npc
+            )
+            npc.state = EntityState(npc_data.get('state', EntityState.ALIVE.value))
+        
+        # Objects are linked to tiles by their coordinates.
+        self._containers = {(data['x'], data['y']): data for data in self.containers}
+        self._doors = {(data['x'], data['y']): data for data in self.doors}
+    
+    def decode(self, text: str) -> list[list[Tile | tuple | None]]:
+        """Decodes the layout of a map file into its tiles.
         
-        self.game.npc.append(enemy_npcs)
+        Args:
+            text (str): The contents of the map file.
+        
+        Returns:
+            list[list[Tile | tuple | None]]: The rows of decoded tiles.
+        """
+        return self._decode_layout(*layout_chars(text))
+    
+    def _decode_layout(self, chars: np.ndarray, lengths: np.ndarray) -> list[list[Tile | tuple | None]]:
+        """Decodes the characters of a map layout into its tiles.
+        
+        Note:
+            - Every character is translated in a single pass through the `MAP_TILES` lookup table,
+              containers and doors are then linked by their coordinates.
+        
+        Args:
+            chars (ndarray): The characters of the map layout, padded to the longest row.
+            lengths (ndarray): The length of each row.
+        """
+        self.height, self.width = chars.shape
+        self.tile_ids, self.collision, grid = self._decode_chars(chars, (0, 0))
+        return [grid[y, :length].tolist() for y, length in enumerate(lengths.tolist())]
+    
+    def _decode_chars(
+            self, chars: np.ndarray, origin: tuple[int, int]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Decodes a block of map characters into its tile IDs, collision flags and tiles.
+        
+        Args:
+            chars (ndarray): The block of map characters.
+            origin (tuple[int, int]): The tile position of the top-left of the block.
+        """
+        tile_ids = _TILE_LOOKUP[chars]
+        collision = _TILE_FLAGS[tile_ids]
+        grid = _TILE_PALETTE[tile_ids]
+        
+        # Objects keep their state, even when their chunk is decoded again.
+        ox, oy = origin
+        for y, x in np.argwhere(np.isin(chars, _OBJECT_CODES)).tolist():
+            position = ox + x, oy + y
+            if position not in self._objects:
+                self._objects[position] = self._decode_object(chr(chars[y, x]), *position)
+            grid[y, x] = self._objects[position]
+            collision[y, x] = tile_flags(grid[y, x])
+        return tile_ids, collision, grid
+    
+    def _decode_chunk(self, position: tuple[int, int], chars: np.ndarray) -> Chunk:
+        """Decodes a chunk of a streamed map, applying any replaced tiles and occupied positions."""
+        size = self.chunks.chunk_size
+        ox, oy = position[0] * size, position[1] * size
+        _, collision, grid = self._decode_chars(chars, (ox, oy))
+        
+        for (x, y), tile in self._overrides.get(position, {}).items():
+            grid[y - oy, x - ox] = tile
+            collision[y - oy, x - ox] = tile_flags(tile)
+        for x, y in self._occupied:
+            if 0 <= x - ox < size and 0 <= y - oy < size:
+                collision[y - oy, x - ox] |= TileFlag.OCCUPIED
+        return Chunk(position, grid, collision)
+    
+    def _load_chunks(self, path: str) -> None:
+        """Opens a large map layout for streaming, (re)compiling its chunk file when out of date."""
+        chunk_path = f"{os.path.splitext(path)[0]}.chunks"
+        if not os.path.exists(chunk_path) or os.path.getmtime(chunk_path) < os.path.getmtime(path):
+            compile_chunks(path, chunk_path)
         
         self.tiles = []
+        self.tile_ids = None
+        self.collision = None
+        self.chunks = ChunkStore(
+            chunk_path, self._decode_chunk, self.game.settings.performance.chunk_budget)
+        self.width, self.height = self.chunks.width, self.chunks.height
+    
+    def door_destinations(self, x: int, y: int, radius: int) -> set[str]:
+        """
+        Gets the destination maps of the doors near a tile position.
         
-        try:
-            with open(f"resources/maps/{filename}.txt", 'r', encoding='utf-8') as map_file:
-                for y, line in enumerate(map_file.readlines()):
-                    row = []
-                    for x, char in enumerate(line.strip()):
-                        tile: Tile | tuple | None = None
-                        match char:
-                            case '#':
-                                tile = MapTiles.BACK_WALL
-                            
-                            case '[':
-                                tile = MapTiles.LEFT_WALL
-                            
-                            case ']':
-                                tile = MapTiles.RIGHT_WALL
-                                
-                            case '{':
-                                tile = MapTiles.FRONT_LEFT_WALL
-                            
-                            case '}':
-                                tile = MapTiles.FRONT_RIGHT_WALL
-                            
-                            case '-':
-                                tile = MapTiles.TILES
-                            
-                            case '%':
-                                tile = (MapTiles.GRASS, MapTiles.RIGHT_WALL)
-                            
-                            case '&':
-                                tile = (MapTiles.GRASS, MapTiles.LEFT_WALL)
-                            
-                            case '$':
-                                tile = (MapTiles.BACK_WALL, MapTiles.LEFT_WALL)
-                            
-                            case ')':
-                                tile = (MapTiles.GRASS, MapTiles.FRONT_RIGHT_WALL)
-                            
-                            case '(':
-                                tile = (MapTiles.GRASS, MapTiles.FRONT_LEFT_WALL)
-                            
-                            case '^':
-                                tile = MapTiles.GRASS
-                            
-                            case 'r':
-                                tile = MapTiles.ROOFTOP
-                            
-                            case 'p':
-                                tile = MapTiles.PATH_H
-                            
-                            case '*':
-                                tile = MapTiles.TREE
-                            
-                            case 'R':
-                                tile = MapTiles.BACK_ROOFTOP
-                            
-                            case '"':
-                                tile = MapTiles.ROCK_WALL
-                            
-                            case "'":
-                                tile = (MapTiles.GRASS, MapTiles.ROCK_EDGE)
-                            
-                            case 'c':
-                                tile = MapTiles.ROCK_CORNER
-                            
-                            case '+':
-                                for _data in self.containers:
-                                    items = []
-                                    if _data['x'] == x and _data['y'] == y:
-                                        coords: tuple[int, int] = _data['x'], _data['y']
-                                        items: list[KeyItem | Item] = _data['items']
-                                
-                                container = Container(self.game, items)
-                                tile = Tile(TILE_ICONS['CRATE'], False, True, container)
-                                #self.game.map_containers.append(container)
-                            
-                            case 'P':
-                                for _data in self.doors:
-                                    if _data['x'] == x and _data['y'] == y:
-                                        lock_state = False
-                                        key = 'test_key'
-                                        destination = _data['destination']
-                                        spawn = _data['spawn']['x'], _data['spawn']['y']
-                                        image = TILE_ICONS['PATH_H']
-                                        door = Door(
-                                            game=self.game,
-                                            location=self.filename,
-                                            position=(x, y),
-                                        destination=destination,
-                                        spawn=spawn,
-                                        key=_data['key'],
-                                        locked=lock_state)
-                                        tile = Tile(image, False, True, door)
-                            
-                            case '>':
-                                key = None
-                                for _data in self.doors:
-                                    if _data['x'] == x and _data['y'] == y:
-                                        lock_state = True if _data['state'] == 'locked' else False
-                                        key = _data['key'] if _data['key'] != 'None' else None
-                                        destination = _data['destination']
-                                        spawn = _data['spawn']['x'], _data['spawn']['y']
-                                image = TILE_ICONS['LEFT_DOOR']
-                                try:
-                                    _check = line.strip()[y][x-1]
-                                    if _check != '?':
-                                        image = TILE_ICONS['RIGHT_DOOR']
-                                except IndexError:
-                                    ...
-                                finally:
-                                    door = Door(self.game, self.filename, (x, y), destination, spawn, key, lock_state)
-                                    tile = Tile(image, False, True, door)
-                            
-                            case '/':
-                                key = None
-                                for _data in self.doors:
-                                    if _data['x'] == x and _data['y'] == y:
-                                        lock_state = True if _data['state'] == 'locked' else False
-                                        key = _data['key'] if _data['key'] != 'None' else None
-                                        destination = _data['destination']
-                                        spawn = _data['spawn']['x'], _data['spawn']['y']
-                                image = TILE_ICONS['CAVE_DOOR']
-                                try:
-                                    _check = line.strip()[y][x-1]
-                                    if _check != '?':
-                                        image = TILE_ICONS['CAVE_DOOR']
-                                except IndexError:
-                                    ...
-                                finally:
-                                    door = Door(self.game, self.filename, (x, y), destination, spawn, key, lock_state)
-                                    tile = Tile(image, False, True, door)
-                            
-                            case '@':
-                                key = None
-                                for _data in self.doors:
-                                    if _data['x'] == x and _data['y'] == y:
-                                        lock_state = True if _data['state'] == 'locked' else False
-                                        key = _data['key'] if _data['key'] != 'None' else None
-                                        destination = _data['destination']
-                                        spawn = _data['spawn']['x'], _data['spawn']['y']
-                                image = TILE_ICONS['LEFT_DOOR']
-                                try:
-                                    _check = line.strip()[y][x-1]
-                                    if _check != '?':
-                                        image = TILE_ICONS['RIGHT_DOOR']
-                                except IndexError:
-                                    ...
-                                finally:
-                                    door = Door(self.game, self.filename, (x, y), destination, spawn, key, lock_state)
-                                    tile = (MapTiles.GRASS, Tile(image, False, True, door))
-                        row.append(tile)
-                    self.tiles.append(row)
-                self.current_map = map_file
-            self.current_file = f"resources/maps/{filename}.txt"
+        Args:
+            x (int): The column of the tile.
+            y (int): The row of the tile.
+            radius (int): The maximum distance (in tiles) to the door on either axis.
+        """
+        return {
+            door['destination'] for (door_x, door_y), door in self._doors.items()
+            if abs(door_x - x) <= radius and abs(door_y - y) <= radius}
+    
+    def _decode_object(self, char: str, x: int, y: int) -> Tile | tuple | None:
+        """Creates the tile for a map character that links to a container or door."""
+        if char == '+':
+            items = self._containers[x, y]['items'] if (x, y) in self._containers else []
+            return Tile('CRATE', False, True, Container(self.game, items))
         
-        except FileNotFoundError as exc:
-            raise FileNotFoundError(exc) from exc
+        _data = self._doors.get((x, y))
+        if char == 'P':
+            if _data is None:
+                return None
+            door = Door(
+                game=self.game,
+                location=self.filename,
+                position=(x, y),
+                destination=_data['destination'],
+                spawn=(_data['spawn']['x'], _data['spawn']['y']),
+                key=_data['key'],
+                locked=False)
+            if self.game.world.is_unlocked(self.filename, (x, y)):
+                door.state = DoorState.UNLOCKED
+            return Tile('PATH_H', False, True, door)
+        
+        # Doors on the left edge of the map face the other way.
+        image = 'CAVE_DOOR' if char == '/' else 'RIGHT_DOOR' if x == 0 else 'LEFT_DOOR'
+        
+        door = None
+        if _data is not None:
+            lock_state = _data['state'] == 'locked'
+            key = _data['key'] if _data['key'] != 'None' else None
+            spawn = _data['spawn']['x'], _data['spawn']['y']
+            door = Door(self.game, self.filename, (x, y), _data['destination'], spawn, key, lock_state)
+            if self.game.world.is_unlocked(self.filename, (x, y)):
+                door.state = DoorState.UNLOCKED
+        tile = Tile(image, False, door is not None, door)
+        
+        if char == '@':
+            return MapTiles.GRASS, tile
+        return tile
     
     def remove_object_data(self, item: Item | KeyItem):
-        """Removes the session XML data values containing an object."""
-        container = self.element_data.find('.//container')
+        """Records an object being taken from its container in the session `WorldState`."""
+        for position, data in self._containers.items():
+            if any(_item is item for _item in data['items']):
+                self.game.world.remove_item(self.filename, position, item.name)
+                return
+    
+    def bake(self) -> None:
+        """Composes the loaded tiles into the cached `layer` surface.
         
-        # Search for the item in the data file & remove the value.
-        try:
-            for _item in container.findall('.//object'):
-                if _item.attrib.get('name') == item.name:
-                    container.find('.//items').remove(_item)
-                    break
-        except AttributeError:
-            pass
+        Note:
+            - Called once from `load`, the layer only needs re-baking when a tile changes (see `set_tile`).
+            - Streamed maps bake each chunk separately, once it is decoded.
+        """
+        self.layer = None
+        if getattr(self.game, 'map', None) is self:
+            self.game.renderer.invalidate()
+        if self.chunks is not None:
+            return
         
-        # Save the current session data into the corresponding data file.
-        with open(f"resources/maps/data/{self.filename}.xml", 'wb') as file:
-            file.write(element.tostring(self.element_data))
-    
-    def render(self) -> None:
-        """Renders the environment from the loaded tiles."""
-        scale = self.game.settings.get_graphics()["SCALE"]
+        self.layer = self._surface(self.width, self.height)
         for y, row in enumerate(self.tiles):
             for x, tile in enumerate(row):
-                if not isinstance(tile, Tile):
-                    if isinstance(tile, tuple):
-                        _rect = pygame.Rect(x * SCALE, y * SCALE + 100, scale**4, scale**4)
-                        try:
-                            self.game.screen.blit(tile[0].texture, _rect)
-                            self.game.screen.blit(tile[1].texture, _rect)
-                        except AttributeError:
-                            self.game.screen.blit(tile[1].texture, _rect)
-                            continue
-                    continue
-                rect = pygame.Rect(x * SCALE, y * SCALE  + 100, scale**4, scale**4)
-                self.game.screen.blit(tile.texture, rect)
+                self._bake_tile(self.layer, x, y, tile)
+    
+    def _bake_chunk(self, chunk: Chunk) -> None:
+        """Composes the tiles of a streamed chunk into its cached `layer` surface."""
+        height, width = chunk.tiles.shape
+        chunk.layer = self._surface(width, height)
+        for (y, x), tile in np.ndenumerate(chunk.tiles):
+            self._bake_tile(chunk.layer, x, y, tile)
+    
+    @staticmethod
+    def _surface(width: int, height: int) -> pygame.Surface:
+        """Creates a surface for baking a layer of tiles."""
+        surface = pygame.Surface((width * SCALE, height * SCALE))
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+        surface.fill(Color.RGB.BLACK)
+        return surface
+    
+    @staticmethod
+    def _bake_tile(surface: pygame.Surface, x: int, y: int, tile: Tile | tuple | None) -> None:
+        """Draws a single tile onto a baked layer surface."""
+        position = (x * SCALE, y * SCALE)
+        surface.fill(Color.RGB.BLACK, pygame.Rect(position, (SCALE, SCALE)))
+        
+        if isinstance(tile, Tile):
+            surface.blit(tile.texture, position)
+        elif isinstance(tile, tuple):
+            for layer in tile:
+                if isinstance(layer, Tile):
+                    surface.blit(layer.texture, position)
+    
+    def tile(self, x: int, y: int) -> Tile | tuple | None:
+        """Gets the tile at a position (``None`` outside the map).
+        
+        Args:
+            x (int): The column of the tile.
+            y (int): The row of the tile.
+        """
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return None
+        if self.chunks is None:
+            row = self.tiles[y]
+            return row[x] if x < len(row) else None
+        size = self.chunks.chunk_size
+        return self.chunks.get(x // size, y // size).tiles[y % size, x % size]
+    
+    def set_tile(self, x: int, y: int, tile: Tile | tuple | None) -> None:
+        """Replaces the tile at a position, and invalidates it within the cached layer.
+        
+        Args:
+            x (int): The column of the tile.
+            y (int): The row of the tile.
+            tile (Tile | tuple | None): The new tile (or layered tiles) for the position.
+        """
+        if self.chunks is not None:
+            size = self.chunks.chunk_size
+            position = x // size, y // size
+            self._overrides.setdefault(position, {})[x, y] = tile
+            chunk = self.chunks.peek(*position)
+            if chunk is not None:
+                chunk.tiles[y % size, x % size] = tile
+                occupied = chunk.collision[y % size, x % size] & TileFlag.OCCUPIED
+                chunk.collision[y % size, x % size] = tile_flags(tile) | occupied
+                if chunk.layer is not None:
+                    self._bake_tile(chunk.layer, x % size, y % size, tile)
+            self.game.renderer.invalidate()
+            return
+        
+        self.tiles[y][x] = tile
+        occupied = self.collision[y, x] & TileFlag.OCCUPIED
+        self.collision[y, x] = tile_flags(tile) | occupied
+        if self.layer is not None:
+            self._bake_tile(self.layer, x, y, tile)
+            self.game.renderer.invalidate()
+    
+    def query(self, xs, ys, flag: TileFlag = TileFlag.PASSABLE) -> np.ndarray:
+        """Checks a flag of the collision grid for a batch of tile positions.
+        
+        Args:
+            xs (ArrayLike): The columns of the tiles.
+            ys (ArrayLike): The rows of the tiles.
+            flag (TileFlag): The flag to check -- **default is** ``PASSABLE``.
+        
+        Returns:
+            ndarray: Whether each position has the flag (positions outside the map never do).
+        """
+        xs, ys = np.broadcast_arrays(np.asarray(xs, dtype=np.intp), np.asarray(ys, dtype=np.intp))
+        inside = (xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.height)
+        result = np.zeros(xs.shape, dtype=bool)
+        result[inside] = (self._collision_at(xs[inside], ys[inside]) & flag) != 0
+        return result
+    
+    def _collision_at(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """Gets the collision flags for positions within the map, decoding any streamed chunks needed."""
+        if self.chunks is None:
+            return self.collision[ys, xs]
+        
+        size = self.chunks.chunk_size
+        flags = np.zeros(xs.shape, dtype=np.uint8)
+        cxs, cys = xs // size, ys // size
+        for cx, cy in set(zip(cxs.tolist(), cys.tolist())):
+            mask = (cxs == cx) & (cys == cy)
+            flags[mask] = self.chunks.get(cx, cy).collision[ys[mask] % size, xs[mask] % size]
+        return flags
+    
+    def flags(self, x: int, y: int) -> TileFlag:
+        """Gets the collision flags of a tile position (``NONE`` outside the map)."""
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return TileFlag.NONE
+        return TileFlag(int(self._collision_at(np.array([x]), np.array([y]))[0]))
+    
+    def is_passable(self, x: int, y: int) -> bool:
+        """Whether a tile position can be walked onto (passable and not occupied)."""
+        return self.flags(x, y) & (TileFlag.PASSABLE | TileFlag.OCCUPIED) == TileFlag.PASSABLE
+    
+    def walkable(self, xs, ys) -> np.ndarray:
+        """Whether each of a batch of tile positions can be walked onto (passable and not occupied)."""
+        return self.query(xs, ys) & ~self.query(xs, ys, TileFlag.OCCUPIED)
+    
+    def line_passable(self, start: tuple[int, int], end: tuple[int, int]) -> bool:
+        """Whether every tile along a straight line between two tile positions is passable."""
+        steps = max(abs(end[0] - start[0]), abs(end[1] - start[1])) + 1
+        xs = np.rint(np.linspace(start[0], end[0], steps)).astype(np.intp)
+        ys = np.rint(np.linspace(start[1], end[1], steps)).astype(np.intp)
+        return bool(np.all(self.walkable(xs, ys)))
+    
+    def set_occupied(self, x: int, y: int, occupied: bool = True) -> None:
+        """Marks whether a tile position is occupied by an entity."""
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return
+        if occupied:
+            self._occupied.add((x, y))
+        else:
+            self._occupied.discard((x, y))
+        
+        collision = self.collision
+        if self.chunks is not None:
+            size = self.chunks.chunk_size
+            chunk = self.chunks.peek(x // size, y // size)
+            if chunk is None:
+                return
+            collision, x, y = chunk.collision, x % size, y % size
+        if occupied:
+            collision[y, x] |= TileFlag.OCCUPIED
+        else:
+            collision[y, x] &= ~TileFlag.OCCUPIED
+    
+    def restore(self, rect: pygame.Rect) -> None:
+        """Redraws the map background over an area of the screen.
+        
+        Args:
+            rect (Rect): The area of the screen to restore.
+        """
+        self.game.screen.fill(Color.RGB.BLACK, rect)
+        self._blit_layers(rect)
+        self.game.renderer.mark(rect)
+    
+    def _visible_layers(self) -> list[tuple[pygame.Surface, tuple[int, int]]]:
+        """Gets the baked layers within the camera viewport, along with their world positions (in pixels)."""
+        if self.chunks is None:
+            return [] if self.layer is None else [(self.layer, (0, 0))]
+        
+        # Cull the chunks by the range of visible tiles.
+        size = self.chunks.chunk_size
+        columns, rows = self.game.camera.visible_tiles()
+        layers = []
+        for cy in range(rows.start // size, -(-rows.stop // size)):
+            for cx in range(columns.start // size, -(-columns.stop // size)):
+                chunk = self.chunks.peek(cx, cy)
+                if chunk is not None and chunk.layer is not None:
+                    layers.append((chunk.layer, (cx * size * SCALE, cy * size * SCALE)))
+        return layers
+    
+    def _blit_layers(self, rect: pygame.Rect | None = None) -> None:
+        """Draws the visible area of the baked layers (or only within an area of the screen) onto the screen."""
+        camera = self.game.camera
+        columns, rows = camera.visible_tiles()
+        visible = pygame.Rect(
+            columns.start * SCALE, rows.start * SCALE, len(columns) * SCALE, len(rows) * SCALE)
+        
+        for layer, (x, y) in self._visible_layers():
+            area = visible.clip(layer.get_rect(topleft=(x, y)))
+            area.topleft = camera.apply(*area.topleft)
+            area = area.clip(camera.viewport)
+            if rect is not None:
+                area = area.clip(rect)
+            if area:
+                ox, oy = camera.apply(x, y)
+                self.game.screen.blit(layer, area, area.move(-ox, -oy))
+    
+    def stream(self) -> None:
+        """Decodes and bakes the chunks of a streamed map needed around the player."""
+        columns, rows = self.game.camera.visible_tiles()
+        radius = -(-max(len(columns), len(rows), 1) // (2 * self.chunks.chunk_size)) + 1
+        x, y = self.game.player.position
+        self.chunks.stream(x // 4, y // 4, radius)
+        for chunk in self.chunks.chunks:
+            if chunk.layer is None:
+                self._bake_chunk(chunk)
+                self.game.renderer.invalidate()
+    
+    def render(self) -> None:
+        """Renders the visible environment from the cached tile layers."""
+        if self.chunks is not None:
+            self.stream()
+        elif self.layer is None:
+            self.bake()
+        if self.game.renderer.is_dirty and not self.game.renderer.redraw:
+            return
+        self._blit_layers()
@@ -0,0 +1,235 @@
+"""Provides the caches of compiled map files and of loaded maps."""
+
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable
+import json
+import os
+import struct
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from source.map import Map
+
+
+"""The directory that compiled maps are written to."""
+CACHE_DIRECTORY = 'resources/maps/compiled'
+
+"""
+The header of a compiled map -->
+{```(magic, version, layout mtime, layout size, data mtime, data size, height, width, records size)```}.
+"""
+HEADER = struct.Struct('<4sHqQqQIII')
+MAGIC = b'TDMP'
+VERSION = 1
+
+
+class CompiledMap:
+    """
+    The parsed contents of a map.
+
+    Attributes:
+        records (dict[str, list[dict]]): The container, door, friendly and enemy NPC records.
+        chars (ndarray | None): The characters of the map layout (``None`` for streamed maps).
+        lengths (ndarray | None): The length of each row of the map layout.
+    """
+    def __init__(self, records: dict[str, list[dict]], chars: np.ndarray | None, lengths: np.ndarray | None) -> None:
+        self.records = records
+        self.chars = chars
+        self.lengths = lengths
+
+
+def _sources(filename: str) -> tuple[os.stat_result, os.stat_result]:
+    """Gets the file status of the layout and data files of a map."""
+    return os.stat(f'resources/maps/{filename}.txt'), os.stat(f'resources/maps/data/{filename}.xml')
+
+
+def read_compiled(filename: str) -> CompiledMap | None:
+    """
+    Reads a compiled map, if it is still up-to-date with its source files.
+
+    Note:
+        - The file is read once, the arrays are views straight onto the read bytes.
+
+    Args:
+        filename (str): The name of the map.
+
+    Returns:
+        CompiledMap | None: The compiled map, or ``None`` if it is missing or out of date.
+    """
+    layout, data = _sources(filename)
+    try:
+        with open(f'{CACHE_DIRECTORY}/{filename}.map', 'rb') as file:
+            buffer = file.read()
+    except FileNotFoundError:
+        return None
+    if len(buffer) < HEADER.size:
+        return None
+
+    magic, version, layout_mtime, layout_size, data_mtime, data_size, height, width, size = \
+        HEADER.unpack_from(buffer)
+    if (magic, version) != (MAGIC, VERSION) or \
+            (layout_mtime, layout_size) != (layout.st_mtime_ns, layout.st_size) or \
+            (data_mtime, data_size) != (data.st_mtime_ns, data.st_size):
+        return None
+
+    offset = HEADER.size
+    lengths = np.frombuffer(buffer, dtype=np.uint32, count=height, offset=offset)
+    offset += lengths.nbytes
+    chars = np.frombuffer(buffer, dtype=np.uint8, count=height * width, offset=offset).reshape(height, width)
+    offset += chars.nbytes
+    records = json.loads(buffer[offset:offset + size])
+    if records.pop('streamed', False):
+        return CompiledMap(records, None, None)
+    return CompiledMap(records, chars, lengths)
+
+
+def write_compiled(filename: str, compiled: CompiledMap) -> None:
+    """
+    Writes a compiled map, stamped with the modification times of its source files.
+
+    Args:
+        filename (str): The name of the map.
+        compiled (CompiledMap): The parsed contents of the map.
+    """
+    layout, data = _sources(filename)
+    chars = compiled.chars if compiled.chars is not None else np.zeros((0, 0), dtype=np.uint8)
+    lengths = compiled.lengths if compiled.lengths is not None else np.zeros(0, dtype=np.uint32)
+    records = json.dumps(
+        {**compiled.records, 'streamed': compiled.chars is None}, separators=(',', ':')).encode('utf-8')
+
+    os.makedirs(CACHE_DIRECTORY, exist_ok=True)
+    path = f'{CACHE_DIRECTORY}/{filename}.map'
+    with open(f'{path}.tmp', 'wb') as file:
+        file.write(HEADER.pack(
+            MAGIC, VERSION, layout.st_mtime_ns, layout.st_size, data.st_mtime_ns, data.st_size,
+            chars.shape[0], chars.shape[1], len(records)))
+        file.write(np.ascontiguousarray(lengths, dtype=np.uint32).tobytes())
+        file.write(np.ascontiguousarray(chars, dtype=np.uint8).tobytes())
+        file.write(records)
+    os.replace(f'{path}.tmp', path)
+
+
+class MapCache:
+    """
+    Keeps the most recently visited maps loaded, so travelling back to one only switches the active map.
+
+    Note:
+        - Cached maps keep their runtime state (*e.g.* emptied containers and unlocked doors).
+        - Maps can be `prefetch`-ed on a worker thread, and are handed over by `get` once they are needed.
+        - Every map that is evicted or cleared is passed to `on_evict` first, so its runtime state can be recorded.
+
+    Attributes:
+        capacity (int): The maximum number of maps to keep loaded (and to prefetch).
+
+    Args:
+        load (Callable): Creates and loads a map --> {```load(filename) -> Map```}.
+        capacity (int): The maximum number of maps to keep loaded -- **default is** ``4``.
+        on_evict (Callable | None): Called with each map before it is forgotten -- **default is** ``None``.
+    """
+    def __init__(
+            self, load: Callable[[str], 'Map'], capacity: int = 4,
+            on_evict: Callable[['Map'], None] | None = None) -> None:
+        self.capacity = capacity
+        self._load = load
+        self._on_evict = on_evict
+        self._maps: OrderedDict[str, 'Map'] = OrderedDict()
+        self._pending: dict[str, Future] = {}
+        self._executor: ThreadPoolExecutor | None = None
+
+    def __contains__(self, filename: str) -> bool:
+        return filename in self._maps
+
+    def __iter__(self):
+        return iter(self._maps.values())
+
+    def __len__(self) -> int:
+        return len(self._maps)
+
+    def get(self, filename: str) -> 'Map':
+        """
+        Gets a map, loading it if it isn't cached.
+
+        Note:
+            - Only blocks for the rest of the load when the map is still being prefetched.
+
+        Args:
+            filename (str): The name of the map.
+
+        Raises:
+            FileNotFoundError: If the map files can't be found.
+        """
+        if filename in self._maps:
+            self._maps.move_to_end(filename)
+            return self._maps[filename]
+
+        if filename in self._pending:
+            self._maps[filename] = self._pending.pop(filename).result()
+        else:
+            self._maps[filename] = self._load(filename)
+        self._evict()
+        return self._maps[filename]
+
+    def prefetch(self, filename: str) -> bool:
+        """
+        Starts loading a map on the worker thread, if it isn't already loaded or being loaded.
+
+        Args:
+            filename (str): The name of the map.
+
+        Returns:
+            bool: Whether the map started loading.
+        """
+        if filename in self._maps or filename in self._pending or len(self._pending) >= self.capacity:
+            return False
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='map-prefetch')
+        self._pending[filename] = self._executor.submit(self._load, filename)
+        return True
+
+    def retain(self, filenames: set[str]) -> None:
+        """
+        Drops the prefetched maps that are no longer wanted (*e.g.* the player walked away from the door).
+
+        Note:
+            - Maps still loading on the worker thread are dropped on a later call, once they finish.
+
+        Args:
+            filenames (set[str]): The names of the maps to keep prefetching.
+        """
+        for filename, future in list(self._pending.items()):
+            if filename in filenames:
+                continue
+            future.cancel()
+            if not future.done():
+                continue
+            del self._pending[filename]
+            if not future.cancelled() and future.exception() is None and future.result().chunks is not None:
+                future.result().chunks.close()
+
+    def is_ready(self, filename: str) -> bool:
+        """Whether a map can be switched to without loading it."""
+        return filename in self._maps or (filename in self._pending and self._pending[filename].done())
+
+    def _evict(self) -> None:
+        """Removes the least recently used maps until the cache is within its capacity."""
+        while len(self._maps) > max(self.capacity, 1):
+            _, evicted = self._maps.popitem(last=False)
+            self._forget(evicted)
+
+    def clear(self) -> None:
+        """Forgets every loaded map, and any that are still being prefetched."""
+        for future in self._pending.values():
+            future.cancel()
+        self._pending.clear()
+        for loaded in self._maps.values():
+            self._forget(loaded)
+        self._maps.clear()
+
+    def _forget(self, loaded: 'Map') -> None:
+        """Hands a map to `on_evict` and releases its chunks."""
+        if self._on_evict is not None:
+            self._on_evict(loaded)
+        if loaded.chunks is not None:
+            loaded.chunks.close()
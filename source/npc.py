@@ -1,37 +1,293 @@
 import pygame
 from abc import abstractmethod
+from typing import Iterator
+
+import numpy as np
 
 from source.entity import Entity
 from source.const import EntityState, Color
 from pygame.surface import Surface, SurfaceType
-from source.utils import directions
+from source.utils import directions, Directions
 from source.const import GameState
 from source.const.states import DialogState
 
 
+class NPCStore:
+    """
+    Keeps the attributes of a map's NPC's in contiguous arrays, so they can be updated in batches.
+    
+    Note:
+        - Each `NPC` is a thin handle onto a row of the arrays, kept for scripting and dialog.
+        - Rows are never removed, dead NPC's are only flagged by their state.
+    
+    Attributes:
+        positions (ndarray): The ``(x, y)`` position of each NPC.
+        health (ndarray): The current health points of each NPC.
+        max_health (ndarray): The maximum health points of each NPC.
+        damage (ndarray): The damage each NPC inflicts.
+        states (ndarray): The `EntityState` value of each NPC.
+        facing (ndarray): The `Directions` value that each NPC faces (``-1`` when it hasn't faced anywhere).
+        handles (list[NPC]): The handle of each NPC.
+        level (Map | None): The map whose occupied tiles follow the living NPC's.
+    
+    Args:
+        capacity (int): The number of NPC's to allocate room for -- **default is** ``16``.
+        level (Map | None): The map the NPC's are on -- **default is** ``None``.
+    """
+    def __init__(self, capacity: int = 16, level=None) -> None:
+        self.level = level
+        self.handles: list['NPC'] = []
+        self._positions = np.zeros((capacity, 2), dtype=np.int32)
+        self._health = np.zeros(capacity, dtype=np.int32)
+        self._max_health = np.zeros(capacity, dtype=np.int32)
+        self._damage = np.zeros(capacity, dtype=np.int32)
+        self._states = np.full(capacity, EntityState.ALIVE.value, dtype=np.int8)
+        self._facing = np.full(capacity, -1, dtype=np.int8)
+    
+    def __len__(self) -> int:
+        return len(self.handles)
+    
+    def __iter__(self) -> Iterator['NPC']:
+        return iter(self.handles)
+    
+    def __getitem__(self, index: int) -> 'NPC':
+        return self.handles[index]
+    
+    @property
+    def positions(self) -> np.ndarray:
+        return self._positions[:len(self)]
+    
+    @property
+    def health(self) -> np.ndarray:
+        return self._health[:len(self)]
+    
+    @property
+    def max_health(self) -> np.ndarray:
+        return self._max_health[:len(self)]
+    
+    @property
+    def damage(self) -> np.ndarray:
+        return self._damage[:len(self)]
+    
+    @property
+    def states(self) -> np.ndarray:
+        return self._states[:len(self)]
+    
+    @property
+    def facing(self) -> np.ndarray:
+        return self._facing[:len(self)]
+    
+    @property
+    def alive(self) -> np.ndarray:
+        """Whether each NPC is alive."""
+        return self.states == EntityState.ALIVE.value
+    
+    def add(self, handle: 'NPC') -> int:
+        """
+        Allocates a row for an NPC, doubling the arrays when they are full.
+        
+        Args:
+            handle (NPC): The handle of the NPC.
+        
+        Returns:
+            int: The index of the NPC's row.
+        """
+        index = len(self.handles)
+        if index == len(self._health):
+            capacity = max(index * 2, 1)
+            self._positions = np.resize(self._positions, (capacity, 2))
+            for name in ('_health', '_max_health', '_damage', '_states', '_facing'):
+                setattr(self, name, np.resize(getattr(self, name), capacity))
+        self._positions[index] = 0
+        self._health[index] = self._max_health[index] = self._damage[index] = 0
+        self._states[index] = EntityState.ALIVE.value
+        self._facing[index] = -1
+        self.handles.append(handle)
+        return index
+    
+    def at(self, position: tuple[int, int]) -> np.ndarray:
+        """Gets the indices of the living NPC's at a position."""
+        return np.flatnonzero(self.alive & np.all(self.positions == position, axis=1))
+    
+    def apply_damage(self, indices: np.ndarray, amounts: np.ndarray | int) -> np.ndarray:
+        """
+        Takes damage off the health of a batch of NPC's, killing any left without health.
+        
+        Args:
+            indices (ndarray): The indices of the NPC's (repeated indices only take damage once).
+            amounts (ndarray | int): The damage taken by each NPC.
+        
+        Returns:
+            ndarray: The indices of the NPC's that died.
+        """
+        indices = np.asarray(indices, dtype=np.intp)
+        health = self.health
+        health[indices] = np.maximum(health[indices] - amounts, 0)
+        
+        killed = indices[(health[indices] == 0) & self.alive[indices]]
+        self.states[killed] = EntityState.DEAD.value
+        for index in killed.tolist():
+            self.handles[index].on_death()
+        return killed
+    
+    def damage_at(self, position: tuple[int, int], amount: int) -> np.ndarray:
+        """
+        Deals damage to every living NPC at a position.
+        
+        Returns:
+            ndarray: The indices of the NPC's that died.
+        """
+        return self.apply_damage(self.at(position), amount)
+    
+    def vacate(self, index: int) -> None:
+        """Frees the tile of an NPC on the `level`, unless another living NPC is on it."""
+        if self.level is None:
+            return
+        tiles = self.positions // 4
+        others = self.alive & np.all(tiles == tiles[index], axis=1)
+        others[index] = False
+        if not others.any():
+            x, y = tiles[index].tolist()
+            self.level.set_occupied(x, y, False)
+    
+    def move(self, indices: np.ndarray, offsets: np.ndarray, level=None) -> np.ndarray:
+        """
+        Moves a batch of living NPC's, turning them to face the way they move.
+        
+        Note:
+            - Moves onto another tile are blocked by impassable or occupied tiles, and when several NPC's move
+              onto the same tile only the first of them does.
+        
+        Args:
+            indices (ndarray): The indices of the NPC's.
+            offsets (ndarray): The ``(dx, dy)`` offset of each NPC.
+            level (Map | None): The map the NPC's are on -- **default is** the store's `level`.
+        
+        Returns:
+            ndarray: The indices of the NPC's that moved.
+        """
+        level = level if level is not None else self.level
+        indices = np.asarray(indices, dtype=np.intp)
+        offsets = np.broadcast_to(np.asarray(offsets, dtype=np.int32), (len(indices), 2))
+        living = self.alive[indices]
+        indices, offsets = indices[living], offsets[living]
+        
+        dx, dy = offsets[:, 0], offsets[:, 1]
+        facing = np.select(
+            [dx > 0, dx < 0, dy < 0, dy > 0],
+            [Directions.EAST.value, Directions.WEST.value, Directions.NORTH.value, Directions.SOUTH.value],
+            self.facing[indices])
+        self.facing[indices] = facing
+        
+        start = self.positions[indices]
+        end = start + offsets
+        before, after = start // 4, end // 4
+        crossing = np.any(before != after, axis=1)
+        allowed = ~crossing | level.walkable(after[:, 0], after[:, 1])
+        
+        # Only the first NPC moving onto a tile takes it.
+        claims = np.flatnonzero(crossing & allowed)
+        _, first = np.unique(after[claims], axis=0, return_index=True)
+        allowed[claims] = False
+        allowed[claims[first]] = True
+        
+        moved = indices[allowed]
+        self.positions[moved] = end[allowed]
+        for (x, y), (nx, ny) in zip(before[allowed & crossing].tolist(), after[allowed & crossing].tolist()):
+            level.set_occupied(x, y, False)
+            level.set_occupied(nx, ny)
+        return moved
+    
+    def visible(self, camera) -> list['NPC']:
+        """Gets the living NPC's on (or a tile around) the tiles within the camera viewport."""
+        columns, rows = camera.visible_tiles()
+        tiles = self.positions // 4
+        mask = self.alive & \
+            (tiles[:, 0] >= columns.start - 1) & (tiles[:, 0] <= columns.stop) & \
+            (tiles[:, 1] >= rows.start - 1) & (tiles[:, 1] <= rows.stop)
+        return [self.handles[index] for index in np.flatnonzero(mask).tolist()]
+
+
 class NPC(Entity):
     """Base NPC class.
     
     Giving structure to all NPC objects.
     
+    Note:
+        - The position, health, damage, state and facing direction live in an `NPCStore`,
+          the NPC is a handle onto its row.
+    
     Attributes:
         game (Game):            The base class object.
         name (str):             The name used to identify the NPC.
         image (str | bytes):    The image used to display 
         is_friendly (bool):     Whether the NPC is friendly or not.
+        store (NPCStore):       The store holding the NPC's attributes.
+        index (int):            The row of the NPC in the store.
         (see `Entity` class for more info.)    
     """
-    state = EntityState.ALIVE
 
     def __init__(
             self, game, name: str, image: str | bytes | Surface | SurfaceType, friendly: bool, position: tuple[int, int],
-            health: int = 100, max_health: int = 100, damage: int = 0) -> None:
+            health: int = 100, max_health: int = 100, damage: int = 0, store: NPCStore | None = None) -> None:
+        self.store = store if store is not None else NPCStore(1)
+        self.index = self.store.add(self)
         super().__init__(health, max_health, damage)
         self.game = game
         self.name = name
         self.image = image
         self.is_friendly = friendly
         self.position = position
+    
+    @property
+    def position(self) -> tuple[int, int]:
+        x, y = self.store.positions[self.index].tolist()
+        return x, y
+    
+    @position.setter
+    def position(self, value: tuple[int, int]) -> None:
+        self.store.positions[self.index] = value
+    
+    @property
+    def health(self) -> int:
+        return int(self.store.health[self.index])
+    
+    @health.setter
+    def health(self, value: int) -> None:
+        self.store.health[self.index] = value
+    
+    @property
+    def max_health(self) -> int:
+        return int(self.store.max_health[self.index])
+    
+    @max_health.setter
+    def max_health(self, value: int) -> None:
+        self.store.max_health[self.index] = value
+    
+    @property
+    def damage(self) -> int:
+        return int(self.store.damage[self.index])
+    
+    @damage.setter
+    def damage(self, value: int) -> None:
+        self.store.damage[self.index] = value
+    
+    @property
+    def state(self) -> EntityState:
+        return EntityState(int(self.store.states[self.index]))
+    
+    @state.setter
+    def state(self, value: EntityState) -> None:
+        self.store.states[self.index] = value.value
+    
+    @property
+    def facing_direction(self) -> Directions | None:
+        value = int(self.store.facing[self.index])
+        return Directions(value) if value >= 0 else None
+    
+    @facing_direction.setter
+    def facing_direction(self, value: Directions | None) -> None:
+        self.store.facing[self.index] = value.value if value is not None else -1
 
     @abstractmethod
     def move(self, direction):
@@ -39,21 +295,31 @@ class NPC(Entity):
     
     def on_death(self) -> None:
         self.state = EntityState.DEAD
+        self.store.vacate(self.index)
     
     def render(self):
-        # Todo -- Provide a generic method for rendering in the NPC sprite.
-        pass
+        """Renders in the NPC sprite, when it is within the camera viewport."""
+        if not isinstance(self.image, (Surface, SurfaceType)):
+            return
+        scale = self.game.graphics['SCALE']
+        rect = self.image.get_rect(topleft=self.game.camera.apply(
+            self.position[0] * scale - (scale * 2),
+            self.position[1] * scale - (scale * 3)))
+        if not self.game.camera.is_visible(rect):
+            return
+        self.game.screen.blit(self.image, rect)
+        self.game.renderer.mark(rect)
 
 
 class StoryNPC(NPC):
     """An NPC class that gives it functionality for prompting dialog upon interaction."""
-    state = DialogState.NONE
+    dialog_state = DialogState.NONE
     
     def __init__(
             self, game, name: str, friendly: bool, image: str | bytes | Surface | SurfaceType,
             scripts: list[str | bytes], position: tuple[int, int], dialog: int = 0, line: int = 0,
-            health: int = 100, max_health: int = 100, damage: int = 0) -> None:
-        super().__init__(game, name, image, friendly, position, health, max_health, damage)
+            health: int = 100, max_health: int = 100, damage: int = 0, store: NPCStore | None = None) -> None:
+        super().__init__(game, name, image, friendly, position, health, max_health, damage, store)
         self.scripts = scripts
         self.dialog_index = dialog
         self.current_script = scripts[dialog]
@@ -61,39 +327,37 @@ class StoryNPC(NPC):
     
     def get_speech(self) -> str:
         """Method for getting the current line of dialog."""
-        with open(f"resources/npc/dialog/{self.scripts[self.dialog_index]}.txt") as script:
-            _speech = script.readlines()[self.line]
-            self.next_line()
-            return _speech
+        _speech = self.game.dialogs.line(self.scripts[self.dialog_index], self.line)
+        self.next_line()
+        return _speech
     
     def interact(self) -> None:
         """Gives the player a way of being able to interact with the NPC."""
         if self.game.state == GameState.RUNNING:
-            if self.state == DialogState.NONE:
+            if self.dialog_state == DialogState.NONE:
                 self.open_dialog()
         elif self.game.state == GameState.DIALOG_OPEN:
-            if self.state == DialogState.IN_DIALOG:
+            if self.dialog_state == DialogState.IN_DIALOG:
                 self.next_line()
     
     def open_dialog(self) -> None:
         """Opens up the dialog menu."""
-        if self.state == DialogState.IN_DIALOG:
+        if self.dialog_state == DialogState.IN_DIALOG:
             return
-        self.state = DialogState.IN_DIALOG
+        self.dialog_state = DialogState.IN_DIALOG
         self.game.state = GameState.DIALOG_OPEN
     
     def close_dialog(self) -> None:
         """Closes the dialog menu."""
-        if self.state == DialogState.NONE:
+        if self.dialog_state == DialogState.NONE:
             return
-        self.state = DialogState.NONE
+        self.dialog_state = DialogState.NONE
         self.game.state = GameState.RUNNING
     
     def next_line(self) -> None:
         """Sets the dialog to the next line."""
-        with open(f"resources/npc/dialog/{self.scripts[self.dialog_index]}.txt") as script:
-            if len(script.readlines()) > self.line:
-                self.line += 1
+        if self.game.dialogs.length(self.scripts[self.dialog_index]) > self.line:
+            self.line += 1
     
     def render(self):
         """Main rendering method for the NPC.
@@ -102,11 +366,11 @@ class StoryNPC(NPC):
             - Handles both Main Game loop and the individual dialog loop when triggered.
         """
         # Render the NPC when game state is running.
-        if self.state == DialogState.NONE:
+        if self.dialog_state == DialogState.NONE:
             return super(StoryNPC, self).render()
 
         # Render the dialog box
-        elif self.state == DialogState.IN_DIALOG:
+        elif self.dialog_state == DialogState.IN_DIALOG:
             conversation = self.get_speech()  # get dialog.
 
             dlg_box = pygame.Surface((150, 80))
@@ -114,6 +378,7 @@ class StoryNPC(NPC):
 
             self.game.fonts['DIALOG'].render(conversation, dlg_box, (150, 100))
             self.game.screen.blit(dlg_box, (100, 100))
+            self.game.renderer.mark(dlg_box.get_rect(topleft=(100, 100)))
             # todo - render in dialog box...
         return
     
@@ -126,7 +391,7 @@ class EnemyNPC(NPC):
 
     def __init__(
             self, game, name: str, image: str | bytes | Surface | SurfaceType, position: tuple[int, int],
-            health: int = 100, max_health: int = 100, damage: int = 2) -> None:
+            health: int = 100, max_health: int = 100, damage: int = 2, store: NPCStore | None = None) -> None:
         super(EnemyNPC, self).__init__(
             game=game,
             name=name,
@@ -135,7 +400,8 @@ class EnemyNPC(NPC):
             position=position,
             health=health,
             max_health=max_health,
-            damage=damage
+            damage=damage,
+            store=store
         )
     
     def move(self, direction):
@@ -1,4 +1,5 @@
-from source.const import SCALE, PLAYER_ICONS, TOTAL_PLAYER_ANIMATION_VALUE
+from source.assets import assets
+from source.const import SCALE, PLAYER_ICONS, TOTAL_PLAYER_ANIMATION_VALUE, PLAYER_SPEED, PLAYER_ANIMATION_SPEED
 from source.const.icons import SWORD_PLAYER_ICONS
 from source.const.icons import TOPBAR_ICONS
 from source.utils.directions import *
@@ -41,10 +42,20 @@ class Player(Entity):
     
     Attributes:
         inventory (Inventory): The players Inventory, for storing items.
-        animation_value (int): An integer value representing the current frame that the player is on.
+        animation_value (float): A value representing the current frame that the player is on.
+        previous_position (tuple[int, int] | None): The position before the last simulation step.
+        sprites (dict[Directions, list[Surface]] | None): The scaled animation frames for each direction.
+        sword_sprites (dict[Directions, Surface] | None): The scaled sword equipped icon for each direction.
     """
     inventory: Inventory
-    animation_value = 0
+    animation_value = 0.0
+    previous_position: tuple[int, int] | None = None
+    _stride = 0.0
+    sprites: dict[Directions, list[pygame.Surface]] | None = None
+    sword_sprites: dict[Directions, pygame.Surface] | None = None
+    sprite_rect: pygame.Rect | None = None
+    _frame = None
+    _topbar = None
     
     def __init__(
             self, game, position: tuple[int, int] = (5, 6),
@@ -68,7 +79,13 @@ class Player(Entity):
         """
         Displays the top bar containing the players health and location status.
         """
-        width, height = pygame.display.get_desktop_sizes()[0]
+        renderer = self.game.renderer
+        topbar = (self.health, self.max_health, self.game.map.filename)
+        if renderer.is_dirty and not renderer.redraw and topbar == self._topbar:
+            return
+        self._topbar = topbar
+        
+        width, height = self.game.screen.get_size()
         bar = pygame.Surface((width, 80))
         bar.fill(Color.RGB.GRAY)
         bar.blit(
@@ -76,6 +93,7 @@ class Player(Entity):
                 f"Location: {str(self.game.map.filename).replace('_', ' ').title()}", 0, Color.RGB.BLACK),
             ((width / 6) * 4, 30))
         self.game.screen.blit(bar, (0, 0))
+        renderer.mark(bar.get_rect())
         
         # Health Bar
         health_display = pygame.Surface((350, 60))
@@ -83,7 +101,7 @@ class Player(Entity):
         hp = self.game.fonts['HEALTH'].render(f"HP: {self.health} / {self.max_health}", 0, Color.RGB.BLACK)
         health_display.blit(hp, (170, 30))
         
-        heart = pygame.transform.scale(pygame.image.load(TOPBAR_ICONS['FULL_HEART']), (30, 30))
+        heart = assets.load(TOPBAR_ICONS['FULL_HEART'], (30, 30))
         n = 0
         if 80 < self.health <= self.max_health:
             n = 5
@@ -101,38 +119,98 @@ class Player(Entity):
                 health_display.blit(heart, (30*i+10, 20))
         self.game.screen.blit(health_display, (10, 10))
     
+    def load_sprites(self) -> None:
+        """Loads, scales and converts every player icon, ready for rendering."""
+        scale = self.game.graphics['SCALE']
+        
+        def _load(path: str) -> pygame.Surface:
+            icon = pygame.transform.scale(
+                pygame.transform.scale(pygame.image.load(path), (scale*4, scale*4)), (40, 40))
+            if pygame.display.get_surface() is not None:
+                icon = icon.convert_alpha()
+            return icon
+        
+        self.sprites = {
+            direction: [_load(path) for path in paths] for direction, paths in PLAYER_ICONS.items()}
+        self.sword_sprites = {
+            direction: _load(path) for direction, path in SWORD_PLAYER_ICONS.items()}
+    
     def render(self) -> None:
         """Render in the players icon."""
         scale = self.game.graphics['SCALE']
-        self.render_topbar()
+        renderer = self.game.renderer
         
         # Create a surface for displaying icon.
+        x, y = self.render_position
         rect = pygame.rect.Rect(
-            self.position[0] * scale - (scale * 2),
-            self.position[1] * scale - (scale * 3) + 100,
-            scale ** 4, scale ** 4)
+            self.game.camera.apply(x * scale - (scale * 2), y * scale - (scale * 3)),
+            (scale ** 4, scale ** 4))
         
-        _x, _y = self.get_facing()
-        try:
-            tile = self.game.map.tiles[_y//4][_x//4]
-        except IndexError:
+        # Get the pre-loaded player icon.
+        if self.sprites is None:
+            self.load_sprites()
+        icon = self.sprites[self.facing_direction][int(self.animation_value/2)]
+        #icon = self.sprites[self.facing_direction][...] if self.equipped is None else \
+        #    self.sword_sprites[self.facing_direction]
+        
+        # Only redraw the player when the sprite has moved or changed frame.
+        frame = (rect.topleft, icon)
+        if renderer.is_dirty and not renderer.redraw and self.sprite_rect is not None:
+            if frame == self._frame:
+                with self.game.frame_timer.phase('hud'):
+                    return self.render_topbar()
+            self.game.map.restore(self.sprite_rect)
+            if self.sprite_rect.top < 80:
+                self._topbar = None
+        self._frame = frame
+        
+        with self.game.frame_timer.phase('hud'):
+            self.render_topbar()
+        self.game.screen.blit(icon, rect)
+        self.sprite_rect = icon.get_rect(topleft=rect.topleft)
+        renderer.mark(self.sprite_rect)
+    
+    @property
+    def render_position(self) -> tuple[float, float]:
+        """The position to draw the player at, interpolated between the last two simulation steps."""
+        if self.previous_position is None:
+            return self.position
+        (px, py), (x, y) = self.previous_position, self.position
+        if abs(x - px) + abs(y - py) > 4:
+            return self.position  # Teleported (e.g. through a door).
+        alpha = self.game.alpha
+        return px + (x - px) * alpha, py + (y - py) * alpha
+    
+    def step(self, dt: float) -> None:
+        """
+        Advances the player movement and walking animation by a fixed timestep.
+        
+        Args:
+            dt (float): The length of the timestep (in seconds).
+        """
+        self.previous_position = self.position
+        keys = self.game.held_keys
+        for key, direction, offset in (
+                ('w', Directions.NORTH, north), ('a', Directions.WEST, west),
+                ('s', Directions.SOUTH, south), ('d', Directions.EAST, east)):
+            if keys[key]:
+                break
+        else:
+            self._stride = 0.0
             return
         
-        if (self.game.held_keys['s'] is True or
-            self.game.held_keys['w'] is True or
-            self.game.held_keys['a'] is True or
-            self.game.held_keys['d'] is True) and isinstance(tile, Tile) and tile.is_passable:
-            self.animation_value += 1
+        self.face(direction)
+        _x, _y = self.get_facing()
+        if self.game.map.is_passable(_x//4, _y//4):
+            self.animation_value += PLAYER_ANIMATION_SPEED * dt
             if self.animation_value > TOTAL_PLAYER_ANIMATION_VALUE:
-                self.animation_value = 0
+                self.animation_value = 0.0
         
-        # Load and transform, the player icon.
-        _icon = PLAYER_ICONS[self.facing_direction][int(self.animation_value/2)]
-        #_icon = PLAYER_ICONS[self.facing_direction] if self.equipped is None else \
-        #    SWORD_PLAYER_ICONS[self.facing_direction]
-        icon = pygame.transform.scale(
-            pygame.transform.scale(pygame.image.load(_icon), (scale*4, scale*4)), (40, 40))
-        self.game.screen.blit(icon, rect)
+        # Walk one position unit at a time, so every unit is checked for collisions.
+        self._stride += PLAYER_SPEED * dt
+        while self._stride >= 1:
+            self._stride -= 1
+            self.move(offset(self.position))
     
     def face(self, direction):
         """Sets the direction that the player is facing."""
@@ -142,11 +220,8 @@ class Player(Entity):
     def move(self, position) -> None:
         """Move the players position if the tile space permits them."""
         x, y = position
-        asset = self.game.map.tiles[y//4][x//4]
-        
-        if isinstance(asset, Tile):
-            if asset.is_passable:
-                self.position = position
+        if self.game.map.is_passable(x//4, y//4):
+            self.position = position
 
     def get_facing(self) -> tuple[int, int] | None:
         """Gets the coordinates of the tile that the player is facing."""
@@ -166,7 +241,7 @@ class Player(Entity):
         direction and location that the player is standing.
         """
         x, y = self.get_facing()
-        tile = self.game.map.tiles[y//4][x//4]
+        tile = self.game.map.tile(x//4, y//4)
         if isinstance(tile, Tile):
             if tile.object is not None and tile.can_interact:
                 return tile.object.interact()
@@ -180,10 +255,5 @@ class Player(Entity):
 
     def attack(self) -> None:
         """Represents a strike or attack on an entity by the player."""
-        x, y = self.get_facing()
-        for npc_types in self.game.npc:
-            for npc in npc_types:
-                if npc.position != (x, y):
-                    continue
-                self.deal_damage(npc)
+        self.game.npc.damage_at(self.get_facing(), self.damage)
         ...  # todo - complete action
@@ -0,0 +1,116 @@
+"""Handles pushing the rendered frame to the display."""
+
+import pygame
+from pygame import Rect
+
+from source.const import Color
+
+
+class Renderer:
+    """Tracks the areas of the screen that have changed, and presents them to the display.
+
+    Note:
+        - ``full``: The whole screen is cleared and flipped every frame.
+        - ``dirty``: Only the marked rectangles are pushed with ``pygame.display.update``,
+          the whole screen is only redrawn when the scene changes (*i.e.* a new map or menu).
+
+    Attributes:
+        mode (str): The render mode, either ``full`` or ``dirty``.
+        rects (list[Rect]): The areas of the screen that have changed this frame.
+        redraw (bool): Whether the whole screen needs to be redrawn this frame.
+
+    Args:
+        game (Game): The main game object.
+        mode (str): The render mode to use -- **default is** ``full``.
+    """
+    MODES = ('full', 'dirty')
+
+    def __init__(self, game, mode: str = 'full') -> None:
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown render mode '{mode}', expected one of {self.MODES}.")
+        self.game = game
+        self.mode = mode
+        self.rects: list[Rect] = []
+        self.redraw = True
+        self._scene = None
+
+    @property
+    def is_dirty(self) -> bool:
+        """Whether the renderer is only presenting the changed areas of the screen."""
+        return self.mode == 'dirty'
+
+    def invalidate(self) -> None:
+        """Forces the whole screen to be redrawn on the next frame."""
+        self.redraw = True
+
+    def mark(self, rect: Rect | tuple) -> None:
+        """
+        Marks an area of the screen as changed.
+
+        Args:
+            rect (Rect | tuple): The area of the screen that has been drawn to.
+        """
+        if self.is_dirty:
+            self.rects.append(Rect(rect))
+
+    def begin(self) -> None:
+        """Prepares the screen for drawing the next frame."""
+        scene = (
+            self.game.state,
+            self.game.main_menu.state,
+            getattr(self.game.map, 'filename', None))
+        if scene != self._scene:
+            self._scene = scene
+            self.redraw = True
+
+        if not self.is_dirty or self.redraw:
+            self.game.screen.fill(Color.RGB.BLACK)
+
+    def present(self) -> None:
+        """Pushes the frame to the display (skipped when headless), ending the frame timings."""
+        if not self.game.headless:
+            with self.game.frame_timer.phase('flip'):
+                self._present()
+        self.rects = []
+        self.redraw = False
+        self.game.frame_timer.end_frame()
+
+    def _present(self) -> None:
+        """Pushes the changed areas (or the whole screen) to the display."""
+        rects = None if not self.is_dirty or self.redraw else self.rects
+        if self.game.screen is not self.game.display:
+            rects = self._scale(rects)
+
+        if rects is None:
+            pygame.display.flip()
+        elif rects:
+            pygame.display.update(rects)
+
+    def _scale(self, rects: list[Rect] | None) -> list[Rect] | None:
+        """
+        Scales the internal render surface (or areas of it) onto the display.
+
+        Args:
+            rects (list[Rect] | None): The areas to scale, or ``None`` for the whole surface.
+
+        Returns:
+            list[Rect] | None: The scaled areas of the display.
+        """
+        screen, display = self.game.screen, self.game.display
+        if rects is None:
+            pygame.transform.scale(screen, display.get_size(), display)
+            return None
+
+        sx = display.get_width() / screen.get_width()
+        sy = display.get_height() / screen.get_height()
+        scaled = []
+        for rect in rects:
+            rect = rect.clip(screen.get_rect())
+            if not rect:
+                continue
+            target = Rect(
+                int(rect.x * sx), int(rect.y * sy),
+                int(rect.w * sx) + 1, int(rect.h * sy) + 1).clip(display.get_rect())
+            display.blit(pygame.transform.scale(screen.subsurface(rect), target.size), target)
+            scaled.append(target)
+        return scaled
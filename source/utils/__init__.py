@@ -1,4 +1,4 @@
 from .directions import *
-from .parse_settings import Settings
+from .parse_settings import Settings, GraphicsSettings, PerformanceSettings
 
-__all__ = ['north', 'south', 'east', 'west', 'Settings', 'Directions']
+__all__ = ['north', 'south', 'east', 'west', 'Settings', 'GraphicsSettings', 'PerformanceSettings', 'Directions']
@@ -1,26 +1,165 @@
 """This module provides accessability and functionality for parsing the ``.TOML`` settings file."""
 
-from typing import BinaryIO, Any
+from dataclasses import dataclass, fields
+from typing import Any, Callable
+import time
+import os
 import tomli
 
 
+@dataclass(frozen=True)
+class GraphicsSettings:
+    """
+    The validated ``[Graphics]`` settings.
+
+    Attributes:
+        fps (int): The base frame rate.
+        width (int): The width of the game area.
+        height (int): The height of the game area.
+        scale (int): The scale used to position the player and menus.
+    """
+    fps: int = 60
+    width: int = 800
+    height: int = 600
+    scale: int = 8
+
+
+@dataclass(frozen=True)
+class PerformanceSettings:
+    """
+    The validated ``[Performance]`` settings, used to tune a deployment without code changes.
+
+    Attributes:
+        render_mode (str): How frames are presented, either ``full`` or ``dirty`` (see `Renderer`).
+        texture_budget (int): The memory budget (in MB) of the texture cache.
+        target_fps (int): The frame rate that the game clock is capped to.
+        render_scale (float): The scale of the internal render surface relative to the window.
+        chunk_budget (int): The maximum number of decoded chunks to keep for streamed maps.
+        map_cache (int): The maximum number of visited maps to keep loaded.
+        prefetch_radius (int): How close (in tiles) the player must be to a door to prefetch its destination,
+            ``0`` disables prefetching.
+    """
+    render_mode: str = 'full'
+    texture_budget: int = 128
+    target_fps: int = 30
+    render_scale: float = 1.0
+    chunk_budget: int = 64
+    map_cache: int = 4
+    prefetch_radius: int = 6
+
+
+def _parse(cls, section: dict[str, Any]):
+    """
+    Converts a settings section into its typed settings object.
+
+    Raises:
+        ValueError: If a value has the wrong type, or a key isn't recognised.
+    """
+    values = {}
+    keys = {field.name.upper(): field for field in fields(cls)}
+    for key, value in section.items():
+        if key.upper() not in keys:
+            raise ValueError(f"Unknown setting '{key}' for {cls.__name__}.")
+        field = keys[key.upper()]
+        if field.type is str and not isinstance(value, str):
+            raise ValueError(f"Invalid value {value!r} for setting '{key}'.")
+        try:
+            values[field.name] = field.type(value)
+        except (TypeError, ValueError) as exc:
+            raise ValueError(f"Invalid value {value!r} for setting '{key}'.") from exc
+    return cls(**values)
+
 
 class Settings:
     """
     Provides a way to be able to load and parse values
     from the ``settings.toml`` file.
-    
+
+    Note:
+        - The file is only parsed once, `poll` re-parses it when its modification time changes
+          and passes the new settings to each subscriber.
+
+    Attributes:
+        graphics (GraphicsSettings): The parsed graphical settings.
+        performance (PerformanceSettings): The parsed performance settings.
+
     Args:
         game (Game): The main game object.
     """
     _file = 'settings.toml'
+    poll_interval = 1.0
 
     def __init__(self, game) -> None:
         self.game = game
+        self._subscribers: list[Callable[['Settings'], None]] = []
+        self._last_poll = 0.0
+        self._mtime = None
+        self.load()
 
-    def get_graphics(self) -> dict[str, Any]:
-        """Retrieves the graphical settings assigned for the application"""
+    def load(self) -> None:
+        """
+        Parses and validates the settings file.
+
+        Raises:
+            ValueError: If any of the settings are invalid.
+        """
+        self._mtime = os.stat(self._file).st_mtime_ns
         with open(self._file, 'rb') as config:
             _config = tomli.load(config)
-        _dict = _config['Graphics']
-        return _dict
\ No newline at end of file
+
+        graphics = _parse(GraphicsSettings, _config.get('Graphics', {}))
+        performance = _parse(PerformanceSettings, _config.get('Performance', {}))
+        if performance.render_mode not in ('full', 'dirty'):
+            raise ValueError(f"Invalid render mode '{performance.render_mode}'.")
+        if min(performance.texture_budget, performance.target_fps,
+               performance.chunk_budget, performance.map_cache) <= 0:
+            raise ValueError("The texture budget, chunk budget, map cache and target FPS must be positive.")
+        if performance.prefetch_radius < 0:
+            raise ValueError("The prefetch radius can't be negative.")
+        if not 0 < performance.render_scale <= 4:
+            raise ValueError("The render scale must be within (0, 4].")
+
+        self.graphics = graphics
+        self.performance = performance
+        self._graphics = {
+            'FPS': graphics.fps, 'Width': graphics.width,
+            'Height': graphics.height, 'SCALE': graphics.scale}
+
+    def subscribe(self, callback: Callable[['Settings'], None]) -> None:
+        """
+        Registers a callback to be called whenever the settings are reloaded.
+
+        Args:
+            callback (Callable[[Settings], None]): Called with the reloaded settings.
+        """
+        self._subscribers.append(callback)
+
+    def poll(self) -> bool:
+        """
+        Reloads the settings if the file has changed, checking at most once every `poll_interval`.
+
+        Returns:
+            bool: Whether the settings were reloaded.
+        """
+        now = time.monotonic()
+        if now - self._last_poll < self.poll_interval:
+            return False
+        self._last_poll = now
+
+        try:
+            if os.stat(self._file).st_mtime_ns == self._mtime:
+                return False
+            previous = self.graphics, self.performance
+            self.load()
+        except (OSError, ValueError, tomli.TOMLDecodeError) as exc:
+            print(f"Unable to reload {self._file}: {exc}")
+            return False
+
+        if (self.graphics, self.performance) != previous:
+            for callback in self._subscribers:
+                callback(self)
+        return True
+
+    def get_graphics(self) -> dict[str, Any]:
+        """Retrieves the graphical settings assigned for the application"""
+        return self._graphics
@@ -0,0 +1,164 @@
+"""This module provides on-demand profiling of the frame loop, exported for pstats and flame-graph tools."""
+
+from typing import Any, Callable
+import cProfile
+import os
+import pstats
+import time
+
+
+"""Calls whose share of a stack is below this (in seconds) are left out of the collapsed stacks."""
+MIN_STACK_TIME = 1e-6
+
+
+def _label(function: tuple[str, int, str]) -> str:
+    """Formats a pstats function key as a single frame of a collapsed stack."""
+    filename, line, name = function
+    if filename == '~':
+        label = name
+    else:
+        label = f'{os.path.basename(filename)}:{line}:{name}'
+    return label.replace(';', ',')
+
+
+def collapse(stats: pstats.Stats) -> dict[str, float]:
+    """
+    Rebuilds the call stacks of a profile from its caller/callee graph.
+
+    Note:
+        - cProfile only records the time of each caller to callee edge, so the time of a function is split
+          between its callers in proportion to the time each call edge took.
+        - Recursive calls are folded into the outermost call.
+
+    Args:
+        stats (Stats): The profile.
+
+    Returns:
+        dict[str, float]: The time (in seconds) spent in each stack, with frames joined by ``;`` from the root.
+    """
+    entries = stats.stats
+    callees: dict[tuple, dict[tuple, float]] = {}
+    for function, (*_, callers) in entries.items():
+        for caller, (*_, cumulative) in callers.items():
+            callees.setdefault(caller, {})[function] = cumulative
+
+    stacks: dict[str, float] = {}
+
+    def walk(function: tuple, share: float, path: list[str], seen: set[tuple]) -> None:
+        _, _, own, cumulative, _ = entries[function]
+        fraction = share / cumulative if cumulative else 0.0
+        path.append(_label(function))
+        seen.add(function)
+        if own * fraction >= MIN_STACK_TIME:
+            stack = ';'.join(path)
+            stacks[stack] = stacks.get(stack, 0.0) + own * fraction
+        for callee, time_taken in callees.get(function, {}).items():
+            if callee not in seen and time_taken * fraction >= MIN_STACK_TIME:
+                walk(callee, time_taken * fraction, path, seen)
+        seen.discard(function)
+        path.pop()
+
+    for function, (_, _, _, cumulative, callers) in entries.items():
+        if not callers:
+            walk(function, cumulative, [], set())
+    return stacks
+
+
+class FrameProfiler:
+    """
+    Profiles the next few frames with cProfile, only while the frame function itself is running.
+
+    Note:
+        - Profiling is scoped to the calls passed to `run` (the `Game.update` of each frame), so idle time
+          (*e.g.* waiting on the frame clock) doesn't hide the real hot spots.
+        - Once the frames are captured, a ``.pstats`` file and a ``.collapsed`` file (one ``stack microseconds``
+          line per stack, as read by ``flamegraph.pl``, speedscope *etc.*) are written to the `directory`.
+
+    Attributes:
+        directory (str): The directory that the profiles are written to.
+        remaining (int): The number of frames still to be profiled (``0`` when not recording).
+        frames (int): The number of frames captured by the current recording.
+        last (str | None): The path (without extension) of the most recently written profile.
+
+    Args:
+        directory (str): The directory that the profiles are written to -- **default is** ``profiles``.
+    """
+    def __init__(self, directory: str = 'profiles') -> None:
+        self.directory = directory
+        self.remaining = 0
+        self.frames = 0
+        self.last: str | None = None
+        self._profile: cProfile.Profile | None = None
+
+    @property
+    def recording(self) -> bool:
+        """Whether frames are being profiled."""
+        return self.remaining > 0
+
+    def start(self, frames: int = 300) -> bool:
+        """
+        Starts profiling the next frames.
+
+        Args:
+            frames (int): The number of frames to profile -- **default is** ``300``.
+
+        Returns:
+            bool: Whether a recording started (``False`` if one is already running).
+        """
+        if self.recording or frames <= 0:
+            return False
+        self._profile = cProfile.Profile()
+        self.remaining = frames
+        self.frames = 0
+        return True
+
+    def run(self, function: Callable[..., Any], *args: Any) -> Any:
+        """
+        Calls the frame function, profiling it if a recording is running.
+
+        Args:
+            function (Callable): The frame function.
+            *args (Any): The arguments of the frame function.
+
+        Returns:
+            Any: The result of the frame function.
+        """
+        if not self.recording:
+            return function(*args)
+        try:
+            return self._profile.runcall(function, *args)
+        finally:
+            self.frames += 1
+            self.remaining -= 1
+            if not self.remaining:
+                self._write()
+
+    def stop(self) -> str | None:
+        """
+        Stops the current recording early, writing the frames captured so far.
+
+        Returns:
+            str | None: The path (without extension) of the written profile, or ``None`` if nothing was recording.
+        """
+        if not self.recording:
+            return None
+        self.remaining = 0
+        return self._write()
+
+    def _write(self) -> str | None:
+        """Writes the pstats and collapsed stack files of the current recording."""
+        profile, self._profile = self._profile, None
+        if profile is None or not self.frames:
+            return None
+
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"update-{time.strftime('%Y%m%d-%H%M%S')}")
+        profile.dump_stats(f'{path}.pstats')
+        stacks = collapse(pstats.Stats(profile))
+        with open(f'{path}.collapsed', 'w', encoding='utf-8') as file:
+            for stack, seconds in sorted(stacks.items()):
+                file.write(f'{stack} {max(round(seconds * 1e6), 1)}\n')
+
+        self.last = path
+        print(f"Profiled {self.frames} frames --> {path}.pstats, {path}.collapsed")
+        return path
@@ -0,0 +1,174 @@
+"""This module provides the recording and deterministic replay of the player input of each frame."""
+
+from dataclasses import dataclass, field
+import struct
+import zlib
+
+import pygame
+
+from source.utils.save_index import write_atomic
+
+
+"""The version of the input recording format written by `InputRecorder`."""
+RECORDING_VERSION = 1
+
+"""The header of an input recording --> {```(magic, version, frame count, payload size, payload CRC-32)```}."""
+RECORDING_HEADER = struct.Struct('<4sHIII')
+RECORDING_MAGIC = b'TDIN'
+
+"""The header of each recorded frame --> {```(elapsed seconds, event count)```}."""
+FRAME = struct.Struct('<dH')
+
+"""The header of each recorded event --> {```(event type, key, unicode length)```}."""
+EVENT = struct.Struct('<HiB')
+
+"""The event types that the game reacts to, the only ones that are recorded."""
+RECORDED_EVENTS = (pygame.KEYDOWN, pygame.KEYUP, pygame.QUIT)
+
+
+@dataclass
+class InputFrame:
+    """
+    The input of a single frame.
+
+    Attributes:
+        elapsed (float): The time since the previous frame (in seconds), which decides the simulation steps run.
+        events (list[tuple[int, int, str]]): The ``(type, key, unicode)`` of each event.
+    """
+    elapsed: float
+    events: list[tuple[int, int, str]] = field(default_factory=list)
+
+    def to_events(self) -> list[pygame.event.Event]:
+        """Rebuilds the pygame events of the frame."""
+        return [
+            pygame.event.Event(kind, key=key, unicode=text) if kind != pygame.QUIT else pygame.event.Event(kind)
+            for kind, key, text in self.events]
+
+
+class InputRecorder:
+    """
+    Records the input events and the elapsed time of every frame.
+
+    Note:
+        - The recording is only written by `close`, as a single compressed file.
+
+    Attributes:
+        path (str): The path of the recording.
+        frames (list[InputFrame]): The recorded frames.
+
+    Args:
+        path (str): The path of the recording.
+    """
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.frames: list[InputFrame] = []
+
+    def record(self, elapsed: float, events: list[pygame.event.Event]) -> None:
+        """
+        Records a frame.
+
+        Args:
+            elapsed (float): The time since the previous frame (in seconds).
+            events (list[Event]): The events of the frame.
+        """
+        self.frames.append(InputFrame(elapsed, [
+            (event.type, getattr(event, 'key', 0), getattr(event, 'unicode', ''))
+            for event in events if event.type in RECORDED_EVENTS]))
+
+    def close(self) -> int:
+        """
+        Writes the recording.
+
+        Returns:
+            int: The size of the recording (in bytes).
+        """
+        body = bytearray()
+        for frame in self.frames:
+            body += FRAME.pack(frame.elapsed, len(frame.events))
+            for kind, key, text in frame.events:
+                encoded = text.encode('utf-8')[:255]
+                body += EVENT.pack(kind, key, len(encoded)) + encoded
+
+        payload = zlib.compress(bytes(body), 9)
+        header = RECORDING_HEADER.pack(
+            RECORDING_MAGIC, RECORDING_VERSION, len(self.frames), len(payload), zlib.crc32(payload))
+        write_atomic(self.path, header + payload)
+        return len(header) + len(payload)
+
+
+class InputReplay:
+    """
+    Plays back an input recording, one frame per `Game.update`.
+
+    Note:
+        - Replaying the same recording from the same starting state (the main menu of a fresh game, with the same
+          save files) runs the same simulation steps with the same input, however fast the frames are run.
+
+    Attributes:
+        path (str): The path of the recording.
+        frames (list[InputFrame]): The recorded frames.
+        index (int): The index of the next frame to play.
+
+    Args:
+        path (str): The path of the recording.
+
+    Raises:
+        FileNotFoundError: If the recording doesn't exist.
+        ValueError: If the recording is corrupt, or was made by a newer version of the game.
+    """
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.frames = self._read(path)
+        self.index = 0
+
+    def __len__(self) -> int:
+        return len(self.frames)
+
+    @property
+    def finished(self) -> bool:
+        """Whether every frame has been played."""
+        return self.index >= len(self.frames)
+
+    def peek(self) -> InputFrame | None:
+        """Gets the next frame without playing it."""
+        return None if self.finished else self.frames[self.index]
+
+    def next(self) -> InputFrame:
+        """
+        Plays the next frame, an empty frame once the recording has finished.
+        """
+        if self.finished:
+            return InputFrame(0.0)
+        self.index += 1
+        return self.frames[self.index - 1]
+
+    @staticmethod
+    def _read(path: str) -> list[InputFrame]:
+        """Reads the frames of a recording."""
+        with open(path, 'rb') as file:
+            buffer = file.read()
+        if len(buffer) < RECORDING_HEADER.size:
+            raise ValueError(f"The input recording '{path}' is truncated.")
+
+        magic, version, count, size, checksum = RECORDING_HEADER.unpack_from(buffer)
+        payload = buffer[RECORDING_HEADER.size:]
+        if magic != RECORDING_MAGIC:
+            raise ValueError(f"'{path}' isn't an input recording.")
+        if version > RECORDING_VERSION:
+            raise ValueError(f"The input recording '{path}' was made by a newer version of the game.")
+        if len(payload) != size or zlib.crc32(payload) != checksum:
+            raise ValueError(f"The input recording '{path}' is corrupt.")
+
+        body = zlib.decompress(payload)
+        frames, offset = [], 0
+        for _ in range(count):
+            elapsed, events = FRAME.unpack_from(body, offset)
+            offset += FRAME.size
+            frame = InputFrame(elapsed)
+            for _ in range(events):
+                kind, key, length = EVENT.unpack_from(body, offset)
+                offset += EVENT.size
+                frame.events.append((kind, key, body[offset:offset + length].decode('utf-8', 'replace')))
+                offset += length
+            frames.append(frame)
+        return frames
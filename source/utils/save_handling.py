@@ -1,13 +1,81 @@
 from source.items import KeyItem, Item
+from source.utils.save_index import SlotInfo, write_atomic
+from source.world import WorldState
 import xml.etree.ElementTree as element
-import tomli
-import shutil
+from typing import Any
+import struct
+import time
+import json
+import zlib
 import os
 
 
+"""The version of the save archive format written by `save_game`."""
+SAVE_VERSION = 1
+
+"""The header of a save archive --> {```(magic, version, payload size, payload CRC-32)```}."""
+ARCHIVE_HEADER = struct.Struct('<4sHII')
+ARCHIVE_MAGIC = b'TDSV'
+
+"""The maps that saves made before the save archives hold a copy of."""
+MAP_FILES = ['test_map', 'test_map2', 'test_map2b', 'cave_entrance']
+
+
+def write_archive(path: str, data: dict[str, Any], level: int = 6) -> int:
+    """
+    Writes save data to a single, compressed archive file.
+    
+    Note:
+        - The archive is written atomically, so a crash while saving leaves the previous save intact.
+    
+    Args:
+        path (str): The path of the archive.
+        data (dict[str, Any]): The JSON compatible save data.
+        level (int): The zlib compression level -- **default is** ``6``.
+    
+    Returns:
+        int: The size of the archive (in bytes).
+    """
+    payload = zlib.compress(json.dumps(data, separators=(',', ':')).encode('utf-8'), level)
+    header = ARCHIVE_HEADER.pack(ARCHIVE_MAGIC, SAVE_VERSION, len(payload), zlib.crc32(payload))
+    write_atomic(path, header + payload)
+    return len(header) + len(payload)
+
+
+def read_archive(path: str) -> dict[str, Any]:
+    """
+    Reads the save data from an archive file.
+    
+    Args:
+        path (str): The path of the archive.
+    
+    Raises:
+        FileNotFoundError: If the archive doesn't exist.
+        ValueError: If the archive is corrupt, or was made by a newer version of the game.
+    """
+    with open(path, 'rb') as file:
+        buffer = file.read()
+    if len(buffer) < ARCHIVE_HEADER.size:
+        raise ValueError(f"The save archive '{path}' is truncated.")
+    
+    magic, version, size, checksum = ARCHIVE_HEADER.unpack_from(buffer)
+    payload = buffer[ARCHIVE_HEADER.size:]
+    if magic != ARCHIVE_MAGIC:
+        raise ValueError(f"'{path}' isn't a save archive.")
+    if version > SAVE_VERSION:
+        raise ValueError(f"The save archive '{path}' was made by a newer version of the game.")
+    if len(payload) != size or zlib.crc32(payload) != checksum:
+        raise ValueError(f"The save archive '{path}' is corrupt.")
+    return json.loads(zlib.decompress(payload))
+
+
 def save_game(game, slot: int, save_name: str):
     """
-    Allows for saving game data to an XML file via a game slot.
+    Allows for saving game data to a game slot.
+    
+    Note:
+        - Only the changes from the default world data are saved (see `WorldState`),
+          into a single archive file --> {```saves/<save_name>.sav```}.
     
     Args:
         game (Game): The main game.
@@ -15,104 +83,102 @@ def save_game(game, slot: int, save_name: str):
         save_name (str): The name to assign the save files to.
     """
     print(game.player.inventory.items)
-    DATA_FILES = ['test_map.xml', 'test_map2.xml', 'test_map2b.xml', 'cave_entrance.xml']
-    with open('resources/maps/data/saves/index.toml', 'rb') as indexer:
-        _data = tomli.load(indexer)['slots']
-        slots = [_data[str(i)] for i in range(1, 5)]
-        open_slot = slots[slot-1]
-        game.savefile = save_name
-        game.save_slot = slot-1
-    
-    # change the indexer value
-    slots[slot-1] = save_name
-    with open('resources/maps/data/saves/index.toml', 'w') as file:
-        file.write('[slots]\n')
-        for i, save in enumerate(slots):
-            file.write(f'{i+1} = "{save}"\n')
-    
-    if not os.path.isdir(f'resources/maps/data/saves/{save_name}'):
-        os.mkdir(f'resources/maps/data/saves/{save_name}')  # make the directory
-    
-    # save the datafiles
-    
-    for filename in DATA_FILES:
-        shutil.copy2(
-            f'resources/maps/data/{filename}',
-            f'resources/maps/data/saves/{save_name}/{filename}')
-    
-    # write the current player data
-    with open(f'resources/maps/data/saves/{save_name}/player_data.xml', 'w') as player_data:
-        if game.player.equipped is not None:
-            player_data.write(f'<player equipped = "{game.player.equipped}">\n')
-        else:
-            player_data.write(f'<player>\n')
-        player_data.write(
-            f'    <stats>\n' +
-            f'        <health current="{game.player.health}" max="{game.player.max_health}"/>\n' +
-            f'        <damage dmg="{game.player.damage}"/>\n' +
-            f'    </stats>\n' +
-            f'    <inventory>\n')
-        if len(game.player.inventory.items) > 0:
-            player_data.write('        <items>\n')
-            for item in game.player.inventory.items:
-                if isinstance(item, KeyItem):
-                    player_data.write(f'            <object type="KeyItem" name="{item.name}" image="{item.image}"/>\n')
-                    continue
-                player_data.write(f'            <object type="Item" name="{item.name}" image="{item.image}"/>\n')
-            player_data.write('        </items>\n')
-        else:
-            player_data.write('        <items/>\n')
-        player_data.write('    </inventory>\n</player>')
-    shutil.copy(
-        f'resources/maps/data/saves/{save_name}/player_data.xml',
-        'resources/maps/data/player_data.xml'
-    )
+    game.savefile = save_name
+    game.save_slot = slot-1
+    
+    # save the changes from the default world data
+    for loaded in game.loaded_maps:
+        game.world.capture(loaded)
+    data = {
+        'player': {
+            'equipped': game.player.equipped,
+            'health': game.player.health,
+            'max_health': game.player.max_health,
+            'damage': game.player.damage,
+            'items': [
+                {'type': type(item).__name__, 'name': item.name, 'image': item.image}
+                for item in game.player.inventory.items],
+        },
+        'world': game.world.to_dict(),
+    }
+    size = write_archive(f'resources/maps/data/saves/{save_name}.sav', data)
+    
+    # change the indexer value, once the save is written
+    game.saves.record(slot, SlotInfo(save_name, time.time(), game.map.filename, game.playtime, size))
 
 
 def load_game(game, slot: int):
     """
-    Sets the XML data files to load previously saved game data.
+    Loads previously saved game data, applying the saved changes onto the default world data.
+    
+    Raises:
+        FileNotFoundError: If the save files can't be found.
+        ValueError: If the save archive is corrupt, or was made by a newer version of the game.
     """
-    DATA_FILES = ['test_map.xml', 'test_map2.xml', 'test_map2b.xml', 'cave_entrance.xml', 'player_data.xml']
     print(str(slot))
-    # set data files to the value stored in the slot
-    with open('resources/maps/data/saves/index.toml', 'rb') as indexer:
-        _data = tomli.load(indexer)['slots']
-        game.save_slot = slot - 1
-        game.savefile = _data[str(slot)]
+    game.save_slot = slot - 1
+    game.savefile = game.saves.names[slot - 1]
     
-    # load the data files
     try:
-        for filename in DATA_FILES:
-            shutil.copy2(
-                f'resources/maps/data/saves/{game.savefile}/{filename}',
-                f'resources/maps/data/{filename}')
-    except FileNotFoundError as exc:
-        raise FileNotFoundError(exc) from exc
-    
-    tree = element.parse(f'resources/maps/data/saves/{game.savefile}/player_data.xml')
-    element_data = tree.getroot()
+        data = read_archive(f'resources/maps/data/saves/{game.savefile}.sav')
+    except FileNotFoundError:
+        data = _read_legacy_save(f'resources/maps/data/saves/{game.savefile}')
     
     # set the player attribute values.
-    try:
-        game.player.equipped = element_data.find('.//player').get('equipped')
-    except AttributeError:
-        game.player.equipped = None
-    health = element_data.find('.//health')
-    game.player.health = int(health.get('current'))
-    game.player.max_health = int(health.get('max'))
-    game.player.damage = int(element_data.find('.//damage').get('dmg'))
-    _items = element_data.findall('.//object')
-    items = []
+    player = data['player']
+    game.player.equipped = player['equipped']
+    game.player.health = player['health']
+    game.player.max_health = player['max_health']
+    game.player.damage = player['damage']
     
     # set the player inventory items
-    for item in _items:
-        name = item.get('name')
-        image = item.get('image') if item.get('image') != 'None' else None
-        if item.get('type').lower() == 'keyitem':
-            items.append(KeyItem(name, image, None))
-        elif item.get('type').lower() == 'item':
-            items.append(Item(name, None))
-        print(items)
-    game.player.inventory.items = items
-    game.map.load('test_map')
+    game.player.inventory.items = [
+        KeyItem(item['name'], item['image'], None) if item['type'].lower() == 'keyitem'
+        else Item(item['name'], item['image'])
+        for item in player['items']]
+    
+    info = game.saves.get(slot)
+    game.playtime = info.playtime if info is not None else 0.0
+    game.loaded_maps.clear()
+    game.world = WorldState.from_dict(data['world'])
+    game.travel('test_map')
+
+
+def _read_legacy_save(directory: str) -> dict:
+    """
+    Reads a save made of full copies of the data files, as the changes it made to the default world data.
+    
+    Args:
+        directory (str): The directory of the save.
+    
+    Raises:
+        FileNotFoundError: If the save files can't be found.
+    """
+    element_data = element.parse(f'{directory}/player_data.xml').getroot()
+    health = element_data.find('.//health')
+    player = {
+        'equipped': element_data.get('equipped'),
+        'health': int(health.get('current')),
+        'max_health': int(health.get('max')),
+        'damage': int(element_data.find('.//damage').get('dmg')),
+        'items': [
+            {'type': item.get('type'), 'name': item.get('name'),
+             'image': item.get('image') if item.get('image') != 'None' else None}
+            for item in element_data.findall('.//object')],
+    }
+    
+    # the items missing from the saved containers were taken
+    world = WorldState()
+    for filename in MAP_FILES:
+        saved = {
+            (int(data.get('x')), int(data.get('y'))): [item.get('name') for item in data.findall('.//object')]
+            for data in element.parse(f'{directory}/{filename}.xml').getroot().findall('.//container')}
+        for data in element.parse(f'resources/maps/data/{filename}.xml').getroot().findall('.//container'):
+            position = int(data.get('x')), int(data.get('y'))
+            remaining = saved.get(position, [])
+            for item in data.findall('.//object'):
+                if item.get('name') in remaining:
+                    remaining.remove(item.get('name'))
+                    continue
+                world.remove_item(filename, position, item.get('name'))
+    return {'player': player, 'world': world.to_dict()}
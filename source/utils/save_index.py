@@ -0,0 +1,140 @@
+"""Provides the in-memory registry of the save slots and their metadata."""
+
+from dataclasses import dataclass
+import json
+import os
+
+import tomli
+
+
+"""The name given to an empty save slot in the index."""
+EMPTY_SLOT = 'default'
+
+
+def write_atomic(path: str, data: bytes) -> None:
+    """
+    Writes a file atomically, by writing to a temporary file and renaming it over the original.
+
+    Args:
+        path (str): The path of the file.
+        data (bytes): The contents of the file.
+    """
+    with open(f'{path}.tmp', 'wb') as file:
+        file.write(data)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(f'{path}.tmp', path)
+
+
+@dataclass(frozen=True)
+class SlotInfo:
+    """
+    The metadata of a saved slot.
+
+    Attributes:
+        name (str): The name of the save.
+        timestamp (float): When the save was made (seconds since the epoch).
+        location (str): The map that the player was on.
+        playtime (float): The total time played (in seconds).
+        size (int): The size of the save archive (in bytes).
+    """
+    name: str
+    timestamp: float = 0.0
+    location: str = ''
+    playtime: float = 0.0
+    size: int = 0
+
+
+class SaveIndex:
+    """
+    Loads the save slot index once, keeping it in memory so the save and load menus never touch the disk.
+
+    Note:
+        - Slots are numbered from ``1``, empty slots are stored as ``default`` in the index.
+        - `record` only updates the registry once the index has been written atomically.
+
+    Attributes:
+        path (str): The path of the index file.
+        slots (list[SlotInfo | None]): The metadata of each slot (``None`` when empty).
+        version (int): Incremented whenever the slots change.
+
+    Args:
+        path (str): The path of the index file -- **default is** ``resources/maps/data/saves/index.toml``.
+        count (int): The minimum number of slots -- **default is** ``4``.
+    """
+    def __init__(self, path: str = 'resources/maps/data/saves/index.toml', count: int = 4) -> None:
+        self.path = path
+        self.version = 0
+        with open(path, 'rb') as index:
+            data = tomli.load(index)
+
+        names = data.get('slots', {})
+        meta = data.get('meta', {})
+        count = max(count, *(int(key) for key in names), 0)
+        self.slots: list[SlotInfo | None] = [None] * count
+        for key, name in names.items():
+            if name != EMPTY_SLOT:
+                self.slots[int(key) - 1] = SlotInfo(name, **meta.get(name, {}))
+        self._options: list[str] | None = None
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    @property
+    def names(self) -> list[str]:
+        """The name of the save in each slot (``default`` when empty)."""
+        return [info.name if info is not None else EMPTY_SLOT for info in self.slots]
+
+    @property
+    def options(self) -> list[str]:
+        """The menu label of each slot, only rebuilt when the slots change."""
+        if self._options is None:
+            self._options = ['Empty' if name == EMPTY_SLOT else name for name in self.names]
+        return self._options
+
+    def get(self, slot: int) -> SlotInfo | None:
+        """
+        Gets the metadata of a slot.
+
+        Args:
+            slot (int): The number of the slot.
+
+        Raises:
+            IndexError: If the slot doesn't exist.
+        """
+        if not 1 <= slot <= len(self.slots):
+            raise IndexError(f"Save slot {slot} doesn't exist.")
+        return self.slots[slot - 1]
+
+    def record(self, slot: int, info: SlotInfo) -> None:
+        """
+        Stores the metadata of a save in a slot, growing the index if needed.
+
+        Args:
+            slot (int): The number of the slot.
+            info (SlotInfo): The metadata of the save.
+        """
+        slots = self.slots + [None] * (slot - len(self.slots))
+        slots[slot - 1] = info
+        self._write(slots)
+        self.slots = slots
+        self._options = None
+        self.version += 1
+
+    def _write(self, slots: list[SlotInfo | None]) -> None:
+        """Writes the index, with the metadata of each saved slot."""
+        lines = ['[slots]']
+        lines += [
+            f'{i + 1} = {json.dumps(info.name if info is not None else EMPTY_SLOT)}' for i, info in enumerate(slots)]
+        written = set()
+        for info in slots:
+            if info is None or info.name in written or info == SlotInfo(info.name):
+                continue
+            written.add(info.name)
+            lines += [
+                '', f'[meta.{json.dumps(info.name)}]',
+                f'timestamp = {info.timestamp!r}', f'location = {json.dumps(info.location)}',
+                f'playtime = {info.playtime!r}', f'size = {info.size}']
+
+        write_atomic(self.path, ('\n'.join(lines) + '\n').encode('utf-8'))
+
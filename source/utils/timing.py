@@ -0,0 +1,145 @@
+"""This module provides simple ways of measuring how long each phase of the start-up and of each frame takes."""
+
+from contextlib import contextmanager
+from time import perf_counter
+import csv
+
+import numpy as np
+
+
+class Stopwatch:
+    """
+    Records the time taken by named phases, in the order they were first recorded.
+
+    Attributes:
+        phases (dict[str, float]): The total time (in seconds) taken by each phase.
+    """
+    def __init__(self) -> None:
+        self.phases: dict[str, float] = {}
+
+    def record(self, name: str, seconds: float) -> None:
+        """
+        Adds an amount of time to a phase.
+
+        Args:
+            name (str): The name of the phase.
+            seconds (float): The time taken (in seconds).
+        """
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    @contextmanager
+    def time(self, name: str):
+        """
+        Times the body of a ``with`` block as a phase.
+
+        Args:
+            name (str): The name of the phase.
+        """
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, perf_counter() - start)
+
+    def report(self, title: str = 'Start-up') -> str:
+        """Formats the recorded phases into a readable report."""
+        width = max((len(name) for name in self.phases), default=0)
+        lines = [f'{title} timings:']
+        for name, seconds in self.phases.items():
+            lines.append(f'    {name.ljust(width)}  {seconds * 1000:8.2f} ms')
+        lines.append(f'    {"total".ljust(width)}  {sum(self.phases.values()) * 1000:8.2f} ms')
+        return '\n'.join(lines)
+
+
+class FrameTimer:
+    """
+    Times each phase of every frame, keeping the most recent frames in fixed-size ring buffers.
+
+    Note:
+        - Phases can be nested, the time of a nested phase isn't counted towards the phase around it.
+
+    Attributes:
+        PHASES (tuple[str]): The phases of a frame, in the order they are reported.
+        size (int): The number of frames kept.
+        frames (int): The total number of frames timed.
+        visible (bool): Whether the timings overlay is shown.
+
+    Args:
+        size (int): The number of frames to keep -- **default is** ``240``.
+    """
+    PHASES = ('events', 'simulation', 'world', 'entities', 'hud', 'menus', 'flip')
+
+    def __init__(self, size: int = 240) -> None:
+        self.size = size
+        self.frames = 0
+        self.visible = False
+        self.samples = np.zeros((size, len(self.PHASES)))
+        self._index = {name: i for i, name in enumerate(self.PHASES)}
+        self._current = np.zeros(len(self.PHASES))
+        self._stack: list[list] = []
+
+    @contextmanager
+    def phase(self, name: str):
+        """
+        Times the body of a ``with`` block as part of a phase of the current frame.
+
+        Args:
+            name (str): The name of the phase, one of `PHASES`.
+        """
+        now = perf_counter()
+        if self._stack:
+            outer = self._stack[-1]
+            self._current[outer[0]] += now - outer[1]
+        entry = [self._index[name], now]
+        self._stack.append(entry)
+        try:
+            yield
+        finally:
+            now = perf_counter()
+            self._current[entry[0]] += now - entry[1]
+            self._stack.pop()
+            if self._stack:
+                self._stack[-1][1] = now
+
+    def end_frame(self) -> None:
+        """Stores the timings of the current frame, overwriting the oldest frame once the buffers are full."""
+        self.samples[self.frames % self.size] = self._current
+        self._current[:] = 0
+        self.frames += 1
+
+    def recent(self) -> np.ndarray:
+        """Gets the phase timings (in seconds) of the kept frames, oldest first."""
+        if self.frames < self.size:
+            return self.samples[:self.frames]
+        return np.roll(self.samples, -(self.frames % self.size), axis=0)
+
+    def summary(self) -> dict[str, tuple[float, float]]:
+        """Gets the rolling average and worst time (in ms) of each phase, and of the whole frame."""
+        recent = self.recent()
+        if not len(recent):
+            return {name: (0.0, 0.0) for name in (*self.PHASES, 'total')}
+        totals = recent.sum(axis=1)
+        summary = {
+            name: (float(recent[:, i].mean()) * 1000, float(recent[:, i].max()) * 1000)
+            for i, name in enumerate(self.PHASES)}
+        summary['total'] = float(totals.mean()) * 1000, float(totals.max()) * 1000
+        return summary
+
+    def export_csv(self, path: str) -> None:
+        """
+        Writes the phase timings (in ms) of the kept frames to a CSV file.
+
+        Args:
+            path (str): The path of the CSV file.
+        """
+        recent = self.recent()
+        with open(path, 'w', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(['frame', *self.PHASES, 'total'])
+            first = self.frames - len(recent)
+            for i, row in enumerate(recent * 1000):
+                writer.writerow([first + i, *(f'{value:.4f}' for value in row), f'{row.sum():.4f}'])
+
+
+"""The stopwatch recording the phases of the game start-up."""
+startup = Stopwatch()
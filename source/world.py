@@ -0,0 +1,126 @@
+"""Provides the in-memory overlay of the changes made to the world during a session."""
+
+from itertools import chain
+from typing import Any
+
+from source.const import EntityState
+
+
+class WorldState:
+    """
+    Records the changes made to the default map data, which are never written back to the data files.
+
+    Note:
+        - Maps apply the overlay when they are built, and saves only store the overlay (see `save_handling`).
+        - NPC state is only recorded by `capture`, as NPC's change every frame of a dialog.
+
+    Attributes:
+        removed (dict[str, dict[tuple[int, int], list[str]]]): The names of the items taken from each container,
+            by map and container position.
+        unlocked (dict[str, set[tuple[int, int]]]): The positions of the unlocked doors, by map.
+        npcs (dict[str, dict[tuple[int, int], dict[str, int]]]): The changed NPC attributes,
+            by map and the position each NPC spawns at.
+    """
+    def __init__(self) -> None:
+        self.removed: dict[str, dict[tuple[int, int], list[str]]] = {}
+        self.unlocked: dict[str, set[tuple[int, int]]] = {}
+        self.npcs: dict[str, dict[tuple[int, int], dict[str, int]]] = {}
+
+    @property
+    def changed(self) -> bool:
+        """Whether anything differs from the default map data."""
+        return bool(self.removed or self.unlocked or self.npcs)
+
+    def remove_item(self, filename: str, position: tuple[int, int], name: str) -> None:
+        """
+        Records an item being taken from a container.
+
+        Args:
+            filename (str): The name of the map containing the container.
+            position (tuple[int, int]): The position of the container.
+            name (str): The name of the item.
+        """
+        self.removed.setdefault(filename, {}).setdefault(position, []).append(name)
+
+    def removed_items(self, filename: str, position: tuple[int, int]) -> list[str]:
+        """Gets the names of the items taken from a container."""
+        return self.removed.get(filename, {}).get(position, [])
+
+    def unlock_door(self, filename: str, position: tuple[int, int]) -> None:
+        """Records a door being unlocked."""
+        self.unlocked.setdefault(filename, set()).add(position)
+
+    def is_unlocked(self, filename: str, position: tuple[int, int]) -> bool:
+        """Whether a door has been unlocked."""
+        return position in self.unlocked.get(filename, ())
+
+    def npc_state(self, filename: str, position: tuple[int, int]) -> dict[str, int]:
+        """Gets the changed attributes of an NPC."""
+        return self.npcs.get(filename, {}).get(position, {})
+
+    def capture(self, loaded) -> None:
+        """
+        Records the NPC attributes that differ from the map data.
+
+        Note:
+            - The rows of the map's `NPCStore` are built in the order of its NPC records,
+              so each NPC is matched to its record (and spawn position) however far it has moved.
+
+        Args:
+            loaded (Map): The map to record the NPC's of.
+        """
+        changes = {}
+        for data, npc in zip(chain(loaded.friendly_npc, loaded.enemy_npc), loaded.npc):
+            x, y = npc.position
+            state = {'health': npc.health, 'state': npc.state.value, 'x': x, 'y': y}
+            if 'dialog' in data:
+                state.update(dialog=npc.dialog_index, line=npc.line)
+            defaults = {'state': EntityState.ALIVE.value, **data}
+            state = {key: value for key, value in state.items() if defaults[key] != value}
+            if state:
+                changes[(data['x'], data['y'])] = state
+        if changes:
+            self.npcs[loaded.filename] = changes
+        else:
+            self.npcs.pop(loaded.filename, None)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Converts the changes into JSON compatible data."""
+        return {
+            'removed': {
+                filename: [[*position, names] for position, names in containers.items()]
+                for filename, containers in self.removed.items()},
+            'unlocked': {filename: sorted(map(list, doors)) for filename, doors in self.unlocked.items()},
+            'npcs': {
+                filename: [[*position, state] for position, state in npcs.items()]
+                for filename, npcs in self.npcs.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> 'WorldState':
+        """
+        Creates the changes from the data of `to_dict`.
+
+        Raises:
+            KeyError | ValueError: If the data is malformed.
+        """
+        state = cls()
+        state.removed = {
+            filename: {(x, y): list(names) for x, y, names in containers}
+            for filename, containers in data.get('removed', {}).items()}
+        state.unlocked = {
+            filename: {(x, y) for x, y in doors} for filename, doors in data.get('unlocked', {}).items()}
+        state.npcs = {
+            filename: {(x, y): dict(values) for x, y, values in npcs}
+            for filename, npcs in data.get('npcs', {}).items()}
+        return state
+
+    def snapshot(self) -> 'WorldState':
+        """Copies the current changes."""
+        return WorldState.from_dict(self.to_dict())
+
+    def clear(self) -> None:
+        """Forgets every change."""
+        self.removed.clear()
+        self.unlocked.clear()
+        self.npcs.clear()